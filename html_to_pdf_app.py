@@ -1,15 +1,31 @@
 import os
 import sys
+import argparse
+import base64
+import bisect
+import codecs
+import collections
+import fnmatch
 import http.server
+import json
+import multiprocessing
+import queue
+import shutil
+import signal
 import socketserver
 import socket
 import subprocess
 import threading
+import time
 import traceback
 import tempfile
+import urllib.error
+import urllib.parse
+import urllib.request
 import webbrowser
 import re
-from typing import Optional, Tuple
+from concurrent.futures import CancelledError, Future
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
@@ -49,86 +65,811 @@ def _ensure_playwright_browsers() -> None:
             pass
 
 
-def convert_html_to_pdf_sync(html_content: str, output_pdf_path: str, continuous: bool = False) -> None:
+def _report_stage(on_stage: Optional[Callable[[str], None]], stage: str) -> None:
+    """Notify an optional progress callback that a conversion entered ``stage``."""
+    if on_stage is not None:
+        on_stage(stage)
+
+
+# Well-known analytics/tracking hosts, blocked when a policy sets "block_trackers"
+TRACKER_PATTERNS = (
+    "*://*google-analytics.com/*",
+    "*://*googletagmanager.com/*",
+    "*://*doubleclick.net/*",
+    "*://*googlesyndication.com/*",
+    "*://connect.facebook.net/*",
+    "*://*hotjar.com/*",
+    "*://*segment.io/*",
+    "*://cdn.segment.com/*",
+    "*://*mixpanel.com/*",
+    "*://*clarity.ms/*",
+    "*://*nr-data.net/*",
+    "*://*newrelic.com/*",
+)
+
+# 1x1 transparent GIF served in place of blocked or oversized images
+_PLACEHOLDER_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+
+class RequestPolicy:
+    """Rules applied to every network request a render makes.
+
+    Built from a plain dict (e.g. a JSON file) with optional keys:
+      block_patterns: URL globs to block, e.g. "*://*.example.com/ads/*"
+      block_trackers: also block TRACKER_PATTERNS
+      block_resource_types: Playwright resource types to block ("font", "media", ...)
+      rewrite_hosts: {"cdn.example.com": "mirror.internal:8080"}
+      max_request_ms: per-request time cap; slower requests are aborted
+      max_image_bytes: images larger than this are blocked (or substituted)
+      placeholder_images: serve a transparent pixel instead of blocking images
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
+        config = config or {}
+        self.block_patterns = list(config.get("block_patterns", []))
+        if config.get("block_trackers"):
+            self.block_patterns.extend(TRACKER_PATTERNS)
+        self.block_resource_types = set(config.get("block_resource_types", []))
+        self.rewrite_hosts: Dict[str, str] = dict(config.get("rewrite_hosts", {}))
+        self.max_request_ms: Optional[float] = config.get("max_request_ms")
+        self.max_image_bytes: Optional[int] = config.get("max_image_bytes")
+        self.placeholder_images = bool(config.get("placeholder_images", False))
+        self.counts: Dict[str, int] = {
+            "allowed": 0,
+            "blocked": 0,
+            "substituted": 0,
+            "rewritten": 0,
+            "timed_out": 0,
+            "failed": 0,
+        }
+
+    @property
+    def needs_routing(self) -> bool:
+        return bool(
+            self.block_patterns
+            or self.block_resource_types
+            or self.rewrite_hosts
+            or self.max_request_ms
+            or self.max_image_bytes
+        )
+
+    def install(self, page) -> None:
+        """Attach the policy to ``page``; counts accumulate in ``self.counts``."""
+        if not self.needs_routing:
+            # Nothing to enforce: skip interception and just count requests
+            def on_request(_request) -> None:
+                self.counts["allowed"] += 1
+
+            page.on("request", on_request)
+            return
+        page.route("**/*", self._handle)
+
+    def _blocked(self, url: str, resource_type: str) -> bool:
+        if resource_type in self.block_resource_types:
+            return True
+        return any(fnmatch.fnmatchcase(url, pattern) for pattern in self.block_patterns)
+
+    def _rewrite(self, url: str) -> str:
+        parts = urllib.parse.urlsplit(url)
+        target = self.rewrite_hosts.get(parts.netloc) or self.rewrite_hosts.get(parts.hostname or "")
+        if not target:
+            return url
+        return urllib.parse.urlunsplit(parts._replace(netloc=target))
+
+    def _substitute(self, route) -> None:
+        route.fulfill(status=200, content_type="image/gif", body=_PLACEHOLDER_GIF)
+        self.counts["substituted"] += 1
+
+    def _handle(self, route, request) -> None:
+        url = request.url
+        resource_type = request.resource_type
+        if url.startswith("data:"):
+            route.continue_()
+            self.counts["allowed"] += 1
+            return
+        if self._blocked(url, resource_type):
+            if resource_type == "image" and self.placeholder_images:
+                self._substitute(route)
+            else:
+                route.abort("blockedbyclient")
+                self.counts["blocked"] += 1
+            return
+
+        target = self._rewrite(url)
+        if target != url:
+            self.counts["rewritten"] += 1
+        check_size = resource_type == "image" and self.max_image_bytes
+        if not (self.max_request_ms or check_size):
+            if target != url:
+                route.continue_(url=target)
+            else:
+                route.continue_()
+            self.counts["allowed"] += 1
+            return
+
+        # Fetch ourselves so the time cap and image size can be enforced
+        fetch_kwargs: Dict[str, Any] = {"url": target}
+        if self.max_request_ms:
+            fetch_kwargs["timeout"] = self.max_request_ms
+        try:
+            response = route.fetch(**fetch_kwargs)
+        except Exception as exc:
+            route.abort("timedout" if "Timeout" in str(exc) else "failed")
+            self.counts["timed_out" if "Timeout" in str(exc) else "failed"] += 1
+            return
+        if check_size and len(response.body()) > self.max_image_bytes:
+            if self.placeholder_images:
+                self._substitute(route)
+            else:
+                route.abort("blockedbyclient")
+                self.counts["blocked"] += 1
+            return
+        route.fulfill(response=response)
+        self.counts["allowed"] += 1
+
+
+def load_request_policy(path: str) -> Dict[str, Any]:
+    """Read a request policy config (JSON) for the request_policy option."""
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError("Request policy must be a JSON object")
+    return config
+
+
+def format_request_stats(counts: Dict[str, int]) -> str:
+    """One-line summary of a RequestPolicy's counts, skipping zero entries."""
+    return ", ".join(f"{value} {name.replace('_', ' ')}" for name, value in counts.items() if value) or "no requests"
+
+
+# Chromium trace categories for --profile: Playwright's defaults (layout,
+# paint, script, frames, CPU profile) plus resource loading for the
+# network waterfall
+TRACE_CATEGORIES = [
+    "-*",
+    "devtools.timeline",
+    "v8.execute",
+    "disabled-by-default-devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame",
+    "disabled-by-default-devtools.timeline.stack",
+    "disabled-by-default-v8.cpu_profiler",
+    "disabled-by-default-v8.cpu_profiler.hires",
+    "toplevel",
+    "blink.console",
+    "blink.user_timing",
+    "latencyInfo",
+    "loading",
+    "blink.resource",
+]
+
+
+def _start_tracing(browser, page, profile_dir: Optional[str]) -> None:
+    """Start a Chromium DevTools trace of ``page`` (None: all pages) if profiling is enabled."""
+    if profile_dir is not None:
+        browser.start_tracing(
+            page=page,
+            path=os.path.join(profile_dir, "chromium-trace.json"),
+            screenshots=True,
+            categories=TRACE_CATEGORIES,
+        )
+
+
+def _stop_tracing(browser, profile_dir: Optional[str]) -> None:
+    """Flush the trace started by _start_tracing().
+
+    Runs in ``finally`` blocks so failed renders still leave a trace; an
+    error here must not replace the render's own exception.
+    """
+    if profile_dir is None:
+        return
+    try:
+        browser.stop_tracing()
+    except Exception:
+        pass
+
+
+def run_profiled(
+    converter: Callable[..., Dict[str, Any]],
+    html_content: Any,
+    output_path: str,
+    profile_dir: Optional[str] = None,
+    on_stage: Optional[Callable[[str], None]] = None,
+    **options: Any,
+) -> Dict[str, Any]:
+    """Run ``converter`` under cProfile and Chromium tracing.
+
+    Writes a trace bundle to ``profile_dir`` (default: next to the output,
+    as ``<output>.profile``):
+      chromium-trace.json  DevTools trace; load in Chrome's Performance panel
+      python.prof          cProfile stats; load with pstats or snakeviz
+      python-profile.txt   top functions by cumulative time
+      profile.json         per-stage timings and the converter's report
+
+    Returns the converter's report with the bundle path under "profile".
+    """
+    import cProfile
+    import io
+    import pstats
+
+    profile_dir = profile_dir or f"{output_path}.profile"
+    os.makedirs(profile_dir, exist_ok=True)
+    started = time.perf_counter()
+    stages: list[Dict[str, Any]] = []
+
+    def timed_stage(stage: str) -> None:
+        now = time.perf_counter() - started
+        if stages:
+            stages[-1]["duration_s"] = round(now - stages[-1]["start_s"], 4)
+        stages.append({"name": stage, "start_s": round(now, 4)})
+        _report_stage(on_stage, stage)
+
+    report: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        report = converter(html_content, output_path, on_stage=timed_stage, profile_dir=profile_dir, **options)
+    except BaseException as exc:
+        # Slow and failing renders are the ones worth profiling, so the
+        # bundle is written for them too (including a watchdog SIGTERM)
+        error = "terminated" if isinstance(exc, SystemExit) else f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        profiler.disable()
+        total = time.perf_counter() - started
+        if stages:
+            stages[-1]["duration_s"] = round(total - stages[-1]["start_s"], 4)
+        profiler.dump_stats(os.path.join(profile_dir, "python.prof"))
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(50)
+        with open(os.path.join(profile_dir, "python-profile.txt"), "w", encoding="utf-8") as f:
+            f.write(summary.getvalue())
+        timings: Dict[str, Any] = {"output": output_path, "total_s": round(total, 4), "stages": stages}
+        if error is not None:
+            timings["error"] = error
+        timings["report"] = report or {}
+        with open(os.path.join(profile_dir, "profile.json"), "w", encoding="utf-8") as f:
+            json.dump(timings, f, indent=2)
+
+    report = dict(report or {})
+    report["profile"] = profile_dir
+    return report
+
+
+def _load_html(page, html_content: str, timeout: Optional[float]) -> None:
+    """Load ``html_content`` and wait for the network to go idle.
+
+    ``timeout`` (seconds) bounds the wait; None keeps Playwright's default.
+    Jobs pass their "load" stage deadline so a page that never settles
+    fails on that deadline rather than on Playwright's 30 s default.
+    """
+    if timeout is None:
+        page.set_content(html_content, wait_until="networkidle")
+    else:
+        page.set_content(html_content, wait_until="networkidle", timeout=timeout * 1000)
+
+
+def _render_page_pdf(page, continuous: bool) -> bytes:
+    """Print a loaded Playwright page to PDF bytes (A4 pages or one tall page)."""
+    if continuous:
+        # Measure full content size and generate a single tall page
+        # Use CSS pixels; Chromium treats 1px = 1/96 inch
+        size = page.evaluate(
+            """
+(() => {
+  const el = document.documentElement;
+  const body = document.body;
+  const width = Math.max(el.scrollWidth, el.offsetWidth, body?.scrollWidth||0, body?.offsetWidth||0);
+  const height = Math.max(el.scrollHeight, el.offsetHeight, body?.scrollHeight||0, body?.offsetHeight||0);
+  return { width, height };
+})()
+            """
+        )
+        width_px = max(1, int(size["width"]))
+        height_px = max(1, int(size["height"]))
+
+        return page.pdf(
+            width=f"{width_px}px",
+            height=f"{height_px}px",
+            print_background=True,
+            margin={"top": "0", "right": "0", "bottom": "0", "left": "0"},
+            prefer_css_page_size=False,
+        )
+    return page.pdf(
+        format="A4",
+        print_background=True,
+        prefer_css_page_size=True,
+    )
+
+
+def convert_html_to_pdf_sync(
+    html_content: str,
+    output_pdf_path: str,
+    continuous: bool = False,
+    on_stage: Optional[Callable[[str], None]] = None,
+    optimize: bool = False,
+    target_dpi: Optional[int] = 150,
+    request_policy: Optional[Dict[str, Any]] = None,
+    profile_dir: Optional[str] = None,
+    load_timeout: Optional[float] = None,
+) -> Dict[str, Any]:
     """Render HTML to PDF using Playwright (Chromium) synchronously.
 
     Args:
         html_content: The complete HTML string to render.
         output_pdf_path: Absolute path to write the resulting PDF file.
+        continuous: Render a single tall page instead of A4 pages.
+        on_stage: Optional callback invoked with the name of each stage
+            ("launch", "load", "render", "write", "optimize") as it starts.
+        optimize: Post-process the file with optimize_pdf().
+        target_dpi: Image resolution cap used when optimizing.
+        request_policy: RequestPolicy config applied to every request.
+        profile_dir: Write a Chromium trace here (see run_profiled()).
+        load_timeout: Seconds to wait for the page's network to go idle.
+
+    Returns:
+        A report with the request counts under "requests" and, when
+        ``optimize`` is set, the optimize_pdf() report under "optimize".
     """
     from playwright.sync_api import sync_playwright  # Imported here to start fast UI
 
+    policy = RequestPolicy(request_policy)
+    _report_stage(on_stage, "launch")
     _ensure_playwright_browsers()
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         context = browser.new_context()
         page = context.new_page()
+        policy.install(page)
+        _start_tracing(browser, page, profile_dir)
+        try:
+            # Use screen media; wait for network to be idle so external CSS/images load
+            _report_stage(on_stage, "load")
+            page.emulate_media(media="screen")
+            _load_html(page, html_content, load_timeout)
 
-        # Use screen media; wait for network to be idle so external CSS/images load
-        page.emulate_media(media="screen")
-        page.set_content(html_content, wait_until="networkidle")
-
-        if continuous:
-            # Measure full content size and generate a single tall page
-            # Use CSS pixels; Chromium treats 1px = 1/96 inch
-            size = page.evaluate(
-                """
-(() => {
-  const el = document.documentElement;
-  const body = document.body;
-  const width = Math.max(el.scrollWidth, el.offsetWidth, body?.scrollWidth||0, body?.offsetWidth||0);
-  const height = Math.max(el.scrollHeight, el.offsetHeight, body?.scrollHeight||0, body?.offsetHeight||0);
-  return { width, height };
-})()
-                """
-            )
-            width_px = max(1, int(size["width"]))
-            height_px = max(1, int(size["height"]))
-
-            pdf_bytes = page.pdf(
-                width=f"{width_px}px",
-                height=f"{height_px}px",
-                print_background=True,
-                margin={"top": "0", "right": "0", "bottom": "0", "left": "0"},
-                prefer_css_page_size=False,
-            )
-        else:
-            pdf_bytes = page.pdf(
-                format="A4",
-                print_background=True,
-                prefer_css_page_size=True,
-            )
+            _report_stage(on_stage, "render")
+            pdf_bytes = _render_page_pdf(page, continuous)
+        finally:
+            _stop_tracing(browser, profile_dir)
 
+        _report_stage(on_stage, "write")
         with open(output_pdf_path, "wb") as f:
             f.write(pdf_bytes)
 
         context.close()
         browser.close()
 
+    report: Dict[str, Any] = {"requests": policy.counts}
+    if optimize:
+        _report_stage(on_stage, "optimize")
+        report["optimize"] = optimize_pdf(output_pdf_path, target_dpi=target_dpi)
+    return report
+
+
+def _pdf_stream_key(stream, canonical: Dict[Any, Any]) -> Tuple[str, str]:
+    """Identity of a PDF stream for deduplication: raw bytes plus its dictionary.
+
+    Indirect values (e.g. an image's /SMask) are canonicalised first so two
+    images whose masks are byte-identical copies also compare equal.
+    """
+    import hashlib
+    import pikepdf
+
+    parts = []
+    for key in sorted(stream.keys()):
+        if key == "/Length":
+            continue
+        value = stream[key]
+        if isinstance(value, pikepdf.Stream):
+            value = _canonical_stream(value, canonical)
+        if isinstance(value, pikepdf.Object) and value.is_indirect:
+            parts.append(f"{key}={value.objgen}")
+        else:
+            parts.append(f"{key}={value!r}")
+    digest = hashlib.sha256(stream.read_raw_bytes()).hexdigest()
+    return digest, "|".join(parts)
+
+
+def _canonical_stream(stream, canonical: Dict[Any, Any]):
+    """Return the first-seen stream identical to ``stream`` (or ``stream`` itself)."""
+    key = _pdf_stream_key(stream, canonical)
+    return canonical.setdefault(key, stream)
+
+
+def _decode_pdf_image(stream):
+    """Decode an image XObject's own samples to a PIL image, ignoring any /SMask.
+
+    Returns None for images PIL cannot represent.
+    """
+    import pikepdf
+
+    # With an /SMask present pikepdf merges it into an RGBA/LA image; decode
+    # the colour samples alone so the mask can be resampled separately
+    smask = stream.get("/SMask")
+    if smask is not None:
+        del stream["/SMask"]
+    try:
+        return pikepdf.PdfImage(stream).as_pil_image()
+    except Exception:
+        return None
+    finally:
+        if smask is not None:
+            stream.SMask = smask
+
+
+def _encode_pdf_image(stream, im) -> Tuple[bytes, Any]:
+    """Encode ``im`` for an image XObject, keeping its encoding family.
+
+    Returns the stream data and its /Filter.
+    """
+    import io
+    import zlib
+    import pikepdf
+
+    if stream.get("/Filter") == pikepdf.Name.DCTDecode:
+        buf = io.BytesIO()
+        im.save(buf, format="JPEG", quality=85, optimize=True)
+        return buf.getvalue(), pikepdf.Name.DCTDecode
+    return zlib.compress(im.tobytes(), 9), pikepdf.Name.FlateDecode
+
+
+def _write_pdf_image(stream, im, encoded: Tuple[bytes, Any]) -> None:
+    """Replace an image XObject's samples with ``im`` encoded by _encode_pdf_image()."""
+    data, filter_name = encoded
+    stream.write(data, filter=filter_name)
+    if "/DecodeParms" in stream:
+        del stream["/DecodeParms"]
+    stream.Width = im.size[0]
+    stream.Height = im.size[1]
+
+
+def _downsample_pdf_image(stream, max_width: float, max_height: float) -> Optional[str]:
+    """Downsample an 8-bit RGB/gray image XObject in place if it exceeds the bounds.
+
+    A soft mask (/SMask, emitted by Chromium for every image with alpha) is
+    resampled to the same size. Returns "downsampled", "larger" when the
+    resampled streams would not be smaller (e.g. a smooth gradient Flate
+    already compressed well) and the image was left alone, or None when
+    the image was not a candidate.
+    """
+    from PIL import Image
+
+    width, height = int(stream.get("/Width", 0)), int(stream.get("/Height", 0))
+    if width <= 0 or height <= 0:
+        return None
+    scale = min(max_width / width, max_height / height)
+    # Skip marginal gains; re-encoding is lossy for JPEG sources
+    if scale >= 0.9:
+        return None
+    if int(stream.get("/BitsPerComponent", 8)) != 8 or "/Decode" in stream or "/Mask" in stream:
+        return None
+    im = _decode_pdf_image(stream)
+    if im is None or im.mode not in ("RGB", "L"):
+        return None
+
+    mask = None
+    smask = stream.get("/SMask")
+    if smask is not None:
+        if int(smask.get("/BitsPerComponent", 8)) != 8 or "/Decode" in smask:
+            return None
+        mask = _decode_pdf_image(smask)
+        if mask is None or mask.mode != "L":
+            return None
+
+    new_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    im = im.resize(new_size, Image.LANCZOS)
+    encoded = _encode_pdf_image(stream, im)
+    old_bytes = len(stream.read_raw_bytes())
+    new_bytes = len(encoded[0])
+    if mask is not None:
+        mask = mask.resize(new_size, Image.LANCZOS)
+        mask_encoded = _encode_pdf_image(smask, mask)
+        old_bytes += len(smask.read_raw_bytes())
+        new_bytes += len(mask_encoded[0])
+    if new_bytes >= old_bytes:
+        return "larger"
+    _write_pdf_image(stream, im, encoded)
+    if mask is not None:
+        _write_pdf_image(smask, mask, mask_encoded)
+    return "downsampled"
+
+
+def optimize_pdf(pdf_path: str, target_dpi: Optional[int] = 150, linearize: bool = True) -> Dict[str, Any]:
+    """Shrink a PDF in place: dedup streams, downsample images, recompress, linearize.
+
+    Identical image XObjects and embedded font files are collapsed to a single
+    object, images larger than ``target_dpi`` at full page size are resampled
+    (pass ``None`` to keep resolution), and the file is rewritten with
+    recompressed streams and object streams, linearized for fast web view.
+
+    The original is kept (``kept_original`` in the report) when the
+    rewritten file would not be smaller.
+
+    Returns a report with byte counts and what was changed.
+    """
+    try:
+        import pikepdf
+    except ImportError as exc:
+        raise RuntimeError("PDF optimisation requires pikepdf (pip install pikepdf)") from exc
+
+    bytes_before = os.path.getsize(pdf_path)
+    report: Dict[str, Any] = {
+        "images_deduplicated": 0,
+        "fonts_deduplicated": 0,
+        "images_downsampled": 0,
+        "images_not_smaller": 0,
+    }
+    canonical: Dict[Any, Any] = {}
+    downsampled: set = set()
+    visited: set = set()
+
+    def process_resources(resources, page_w_in: float, page_h_in: float) -> None:
+        if resources is None:
+            return
+        if resources.is_indirect:
+            if resources.objgen in visited:
+                return
+            visited.add(resources.objgen)
+
+        xobjects = resources.get("/XObject")
+        if xobjects is not None:
+            for name in list(xobjects.keys()):
+                xobj = xobjects[name]
+                subtype = xobj.get("/Subtype")
+                if subtype == pikepdf.Name.Form:
+                    process_resources(xobj.get("/Resources"), page_w_in, page_h_in)
+                    continue
+                if subtype != pikepdf.Name.Image:
+                    continue
+                keep = _canonical_stream(xobj, canonical)
+                if keep.objgen != xobj.objgen:
+                    xobjects[name] = keep
+                    report["images_deduplicated"] += 1
+                if target_dpi and keep.objgen not in downsampled:
+                    downsampled.add(keep.objgen)
+                    outcome = _downsample_pdf_image(keep, page_w_in * target_dpi, page_h_in * target_dpi)
+                    if outcome == "downsampled":
+                        report["images_downsampled"] += 1
+                    elif outcome == "larger":
+                        report["images_not_smaller"] += 1
+
+        fonts = resources.get("/Font")
+        if fonts is not None:
+            for name in list(fonts.keys()):
+                font = fonts[name]
+                descriptors = [font.get("/FontDescriptor")]
+                for descendant in font.get("/DescendantFonts", []):
+                    descriptors.append(descendant.get("/FontDescriptor"))
+                for descriptor in descriptors:
+                    if descriptor is None:
+                        continue
+                    for key in ("/FontFile", "/FontFile2", "/FontFile3"):
+                        font_file = descriptor.get(key)
+                        if font_file is None:
+                            continue
+                        keep = _canonical_stream(font_file, canonical)
+                        if keep.objgen != font_file.objgen:
+                            descriptor[key] = keep
+                            report["fonts_deduplicated"] += 1
+
+    with pikepdf.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            box = page.mediabox
+            page_w_in = abs(float(box[2]) - float(box[0])) / 72.0
+            page_h_in = abs(float(box[3]) - float(box[1])) / 72.0
+            process_resources(page.obj.get("/Resources"), page_w_in, page_h_in)
+        pdf.remove_unreferenced_resources()
+
+        # Write next to the original so the final replace is atomic
+        fd, tmp_path = tempfile.mkstemp(suffix=".pdf", dir=os.path.dirname(os.path.abspath(pdf_path)))
+        os.close(fd)
+        try:
+            pdf.save(
+                tmp_path,
+                compress_streams=True,
+                recompress_flate=True,
+                object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                linearize=linearize,
+            )
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    # Never make the file bigger: keep the original if the rewrite did not help
+    kept_original = os.path.getsize(tmp_path) >= bytes_before
+    if kept_original:
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, pdf_path)
+
+    bytes_after = os.path.getsize(pdf_path)
+    report.update(
+        bytes_before=bytes_before,
+        bytes_after=bytes_after,
+        bytes_saved=bytes_before - bytes_after,
+        linearized=linearize and not kept_original,
+        kept_original=kept_original,
+    )
+    return report
+
+
+def format_optimize_report(report: Dict[str, Any]) -> str:
+    """One-line human summary of an optimize_pdf() report."""
+    before = report["bytes_before"]
+    saved = report["bytes_saved"]
+    percent = (100.0 * saved / before) if before else 0.0
+    if report.get("kept_original"):
+        return f"{before / 1024:.0f} KB, already optimal (original kept)"
+    return (
+        f"{before / 1024:.0f} KB -> {report['bytes_after'] / 1024:.0f} KB "
+        f"(saved {saved / 1024:.0f} KB, {percent:.0f}%; "
+        f"{report['images_deduplicated']} images and {report['fonts_deduplicated']} fonts deduplicated, "
+        f"{report['images_downsampled']} images downsampled"
+        + (f", {report['images_not_smaller']} left as is" if report.get("images_not_smaller") else "")
+        + ")"
+    )
+
+
+def merge_pdf_documents(parts: list[Tuple[str, bytes]], output_pdf_path: str) -> list[Dict[str, Any]]:
+    """Concatenate PDFs into one file with a bookmark per part.
+
+    Returns the page-range index: one entry per part with its name and
+    1-based first/last page in the merged file.
+    """
+    import io
+    import pikepdf
+
+    merged = pikepdf.new()
+    sources = []
+    index: list[Dict[str, Any]] = []
+    try:
+        for name, pdf_bytes in parts:
+            src = pikepdf.open(io.BytesIO(pdf_bytes))
+            # Sources must stay open until the merged file is saved
+            sources.append(src)
+            first = len(merged.pages) + 1
+            merged.pages.extend(src.pages)
+            index.append({"name": name, "first_page": first, "last_page": len(merged.pages), "pages": len(src.pages)})
+        with merged.open_outline() as outline:
+            for entry in index:
+                outline.root.append(pikepdf.OutlineItem(entry["name"], entry["first_page"] - 1))
+        merged.save(output_pdf_path)
+    finally:
+        for src in sources:
+            src.close()
+        merged.close()
+    return index
+
+
+def convert_html_bundle_to_pdf_sync(
+    documents: list[Dict[str, str]],
+    output_pdf_path: str,
+    continuous: bool = False,
+    on_stage: Optional[Callable[[str], None]] = None,
+    optimize: bool = False,
+    target_dpi: Optional[int] = 150,
+    request_policy: Optional[Dict[str, Any]] = None,
+    profile_dir: Optional[str] = None,
+    load_timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Render many HTML documents into a single PDF with one browser.
+
+    Each document is loaded into a fresh page of one shared browser
+    context, printed to PDF in memory, and the parts are merged natively
+    with a bookmark per document. A page per document keeps every
+    document's stylesheets, scripts (globals, timers, listeners) and body
+    styles isolated while the browser and its HTTP cache are reused;
+    optimizing afterwards also deduplicates images and fonts shared
+    between them.
+
+    Args:
+        documents: Dicts with a "name" and either "html" or "path".
+        output_pdf_path: Absolute path to write the merged PDF file.
+        continuous: Render each document as one tall page.
+        on_stage: Progress callback; "load"/"render" repeat per document.
+        optimize, target_dpi, request_policy, profile_dir, load_timeout: As
+            for convert_html_to_pdf_sync(); load_timeout applies per document.
+
+    Returns:
+        A report with the page-range index under "bundle", request counts
+        under "requests" and, when optimizing, "optimize".
+    """
+    from playwright.sync_api import sync_playwright
+
+    policy = RequestPolicy(request_policy)
+    parts: list[Tuple[str, bytes]] = []
+    _report_stage(on_stage, "launch")
+    _ensure_playwright_browsers()
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        context = browser.new_context()
+        # Trace the whole browser: each document gets its own page
+        _start_tracing(browser, None, profile_dir)
+        try:
+            for number, document in enumerate(documents, start=1):
+                name = document.get("name") or f"Document {number}"
+                html_content = document.get("html")
+                if html_content is None:
+                    with open(document["path"], "r", encoding="utf-8") as f:
+                        html_content = f.read()
+                # set_content() reuses the page's window (document.open/write), so
+                # a shared page would leak one document's globals into the next
+                page = context.new_page()
+                policy.install(page)
+                page.emulate_media(media="screen")
+                try:
+                    _report_stage(on_stage, "load")
+                    _load_html(page, html_content, load_timeout)
+                    _report_stage(on_stage, "render")
+                    parts.append((name, _render_page_pdf(page, continuous)))
+                finally:
+                    page.close()
+        finally:
+            _stop_tracing(browser, profile_dir)
+        context.close()
+        browser.close()
 
-def convert_html_to_png_sync(html_content: str, output_png_path: str) -> None:
-    """Render HTML to a full-page PNG using Playwright (Chromium)."""
+    _report_stage(on_stage, "write")
+    index = merge_pdf_documents(parts, output_pdf_path)
+    report: Dict[str, Any] = {"bundle": index, "requests": policy.counts}
+    if optimize:
+        _report_stage(on_stage, "optimize")
+        report["optimize"] = optimize_pdf(output_pdf_path, target_dpi=target_dpi)
+    return report
+
+
+def convert_html_to_png_sync(
+    html_content: str,
+    output_png_path: str,
+    on_stage: Optional[Callable[[str], None]] = None,
+    request_policy: Optional[Dict[str, Any]] = None,
+    profile_dir: Optional[str] = None,
+    load_timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Render HTML to a full-page PNG using Playwright (Chromium).
+
+    Returns a report with the request counts under "requests".
+    """
     from playwright.sync_api import sync_playwright
 
+    policy = RequestPolicy(request_policy)
+    _report_stage(on_stage, "launch")
     _ensure_playwright_browsers()
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         context = browser.new_context()
         page = context.new_page()
+        policy.install(page)
+        _start_tracing(browser, page, profile_dir)
+        try:
+            _report_stage(on_stage, "load")
+            page.emulate_media(media="screen")
+            _load_html(page, html_content, load_timeout)
 
-        page.emulate_media(media="screen")
-        page.set_content(html_content, wait_until="networkidle")
-
-        png_bytes = page.screenshot(full_page=True, type="png")
+            _report_stage(on_stage, "render")
+            png_bytes = page.screenshot(full_page=True, type="png")
+        finally:
+            _stop_tracing(browser, profile_dir)
 
+        _report_stage(on_stage, "write")
         with open(output_png_path, "wb") as f:
             f.write(png_bytes)
 
         context.close()
         browser.close()
 
+    return {"requests": policy.counts}
+
 
-def convert_html_to_docx_sync(html_content: str, output_docx_path: str) -> None:
+def convert_html_to_docx_sync(
+    html_content: str,
+    output_docx_path: str,
+    on_stage: Optional[Callable[[str], None]] = None,
+    request_policy: Optional[Dict[str, Any]] = None,
+    profile_dir: Optional[str] = None,
+    load_timeout: Optional[float] = None,
+) -> Dict[str, Any]:
     """Convert HTML to DOCX by rasterizing to PNG and embedding it."""
     import tempfile
     from docx import Document
@@ -136,23 +877,42 @@ def convert_html_to_docx_sync(html_content: str, output_docx_path: str) -> None:
 
     with tempfile.TemporaryDirectory() as tmpdir:
         png_path = os.path.join(tmpdir, "page.png")
-        convert_html_to_png_sync(html_content, png_path)
+        report = convert_html_to_png_sync(
+            html_content,
+            png_path,
+            on_stage=on_stage,
+            request_policy=request_policy,
+            profile_dir=profile_dir,
+            load_timeout=load_timeout,
+        )
 
+        _report_stage(on_stage, "package")
         doc = Document()
         # Fit image to typical page width; python-docx will keep aspect ratio
         doc.add_picture(png_path, width=Inches(6.5))
         doc.save(output_docx_path)
+    return report
 
 
-def convert_html_to_pptx_sync(html_content: str, output_pptx_path: str) -> None:
+def convert_html_to_pptx_sync(
+    html_content: str,
+    output_pptx_path: str,
+    on_stage: Optional[Callable[[str], None]] = None,
+    request_policy: Optional[Dict[str, Any]] = None,
+    profile_dir: Optional[str] = None,
+    load_timeout: Optional[float] = None,
+) -> Dict[str, Any]:
     """Convert HTML to PPTX creating one slide per .slide section if present.
 
     Fallback: if no .slide sections found, capture full page as a single slide.
+    Returns a report with the request counts under "requests".
     """
     import tempfile
     from pptx import Presentation
     from playwright.sync_api import sync_playwright
 
+    policy = RequestPolicy(request_policy)
+    _report_stage(on_stage, "launch")
     _ensure_playwright_browsers()
     with tempfile.TemporaryDirectory() as tmpdir:
         screenshots: list[str] = []
@@ -164,35 +924,42 @@ def convert_html_to_pptx_sync(html_content: str, output_pptx_path: str) -> None:
             # but 100vh/100vw-based layouts will be consistent
             context = browser.new_context(viewport={"width": 1920, "height": 1080})
             page = context.new_page()
+            policy.install(page)
+            _start_tracing(browser, page, profile_dir)
+            try:
+                _report_stage(on_stage, "load")
+                page.emulate_media(media="screen")
+                _load_html(page, html_content, load_timeout)
 
-            page.emulate_media(media="screen")
-            page.set_content(html_content, wait_until="networkidle")
+                _report_stage(on_stage, "render")
 
-            # Prefer <section class="slide">, else any .slide
-            locator = page.locator("section.slide, .slide")
-            count = locator.count()
+                # Prefer <section class="slide">, else any .slide
+                locator = page.locator("section.slide, .slide")
+                count = locator.count()
 
-            if count == 0:
-                # Fallback: single screenshot of the full page
-                png_path = os.path.join(tmpdir, "slide-1.png")
-                page.screenshot(path=png_path, full_page=True, type="png")
-                screenshots.append(png_path)
-            else:
-                for i in range(count):
-                    # Element screenshots auto-scroll into view
-                    el = locator.nth(i)
-                    # Record aspect ratio (h/w) from first slide for PPTX slide sizing
-                    if i == 0:
-                        box = el.bounding_box()
-                        if box and box.get("width") and box.get("height"):
-                            first_slide_ratio = max(0.01, float(box["height"]) / float(box["width"]))
-                    png_path = os.path.join(tmpdir, f"slide-{i+1}.png")
-                    el.screenshot(path=png_path, type="png")
+                if count == 0:
+                    # Fallback: single screenshot of the full page
+                    png_path = os.path.join(tmpdir, "slide-1.png")
+                    page.screenshot(path=png_path, full_page=True, type="png")
                     screenshots.append(png_path)
-
+                else:
+                    for i in range(count):
+                        # Element screenshots auto-scroll into view
+                        el = locator.nth(i)
+                        # Record aspect ratio (h/w) from first slide for PPTX slide sizing
+                        if i == 0:
+                            box = el.bounding_box()
+                            if box and box.get("width") and box.get("height"):
+                                first_slide_ratio = max(0.01, float(box["height"]) / float(box["width"]))
+                        png_path = os.path.join(tmpdir, f"slide-{i+1}.png")
+                        el.screenshot(path=png_path, type="png")
+                        screenshots.append(png_path)
+            finally:
+                _stop_tracing(browser, profile_dir)
             context.close()
             browser.close()
 
+        _report_stage(on_stage, "package")
         prs = Presentation()
         # If we detected a slide aspect ratio, size the PPTX accordingly to avoid
         # top/bottom whitespace when fitting images.
@@ -223,6 +990,1387 @@ def convert_html_to_pptx_sync(html_content: str, output_pptx_path: str) -> None:
 
             slide.shapes.add_picture(png, left=left, top=top, width=target_w, height=target_h)
         prs.save(output_pptx_path)
+    return {"requests": policy.counts}
+
+
+# ---------- Conversion jobs ----------
+
+# Exit codes for headless (--convert) use
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_TIMEOUT = 3
+EXIT_CANCELLED = 4
+EXIT_CRASHED = 5
+
+# Seconds a conversion may spend in each stage before the watchdog kills it.
+# "launch" includes a possible first-run Chromium download.
+DEFAULT_STAGE_TIMEOUTS: Dict[str, float] = {
+    "start": 60.0,
+    "launch": 300.0,
+    "load": 90.0,
+    "render": 120.0,
+    "write": 60.0,
+    "package": 120.0,
+    "optimize": 180.0,
+}
+
+_CONVERTERS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "pdf": convert_html_to_pdf_sync,
+    "png": convert_html_to_png_sync,
+    "docx": convert_html_to_docx_sync,
+    "pptx": convert_html_to_pptx_sync,
+    # Takes a list of documents instead of a single HTML string
+    "bundle": convert_html_bundle_to_pdf_sync,
+}
+# Converters that take one HTML document (everything except "bundle")
+DOCUMENT_FORMATS = ("pdf", "png", "docx", "pptx")
+
+# Extra seconds a profiled job gets past each stage deadline. The worker's
+# own Playwright timeouts fire first and unwind normally, which flushes the
+# Chromium trace and cProfile stats before the watchdog would kill it.
+PROFILE_FLUSH_GRACE = 15.0
+
+# Substrings of Playwright errors raised when Chromium (or its driver) dies
+# underneath a conversion; these are retried instead of reported.
+_CRASH_MARKERS = (
+    "Target crashed",
+    "Page crashed",
+    "Target page, context or browser has been closed",
+    "Browser has been closed",
+    "Browser closed",
+    "Connection closed",
+)
+
+
+class JobCancelled(Exception):
+    """Raised when a conversion job was cancelled before it finished."""
+
+
+class JobTimeout(Exception):
+    """Raised when a conversion job exceeded the deadline of a stage."""
+
+    def __init__(self, stage: str, limit: float) -> None:
+        super().__init__(f"Conversion timed out in stage '{stage}' after {limit:g}s")
+        self.stage = stage
+        self.limit = limit
+
+
+class RendererCrashed(Exception):
+    """Raised when the browser or the worker process died mid-conversion."""
+
+
+class ConversionFailed(Exception):
+    """Raised when a conversion failed; ``details`` holds the worker traceback."""
+
+    def __init__(self, details: str) -> None:
+        super().__init__(details.strip().splitlines()[-1] if details.strip() else "Conversion failed")
+        self.details = details
+
+
+class CancelToken:
+    """Thread-safe flag shared between the requester of a job and its watchdog."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+def _spool_dir() -> str:
+    """Directory for job outputs that have no destination yet.
+
+    Prefers /dev/shm (tmpfs, i.e. shared memory) where available so spooled
+    results never touch disk before they are streamed out.
+    """
+    base = tempfile.gettempdir()
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        base = "/dev/shm"
+    path = os.path.join(base, "html-to-pdf-spool")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class ResultHandle:
+    """A conversion output in a spool file, passed between processes by path.
+
+    The worker process writes the file; the parent only ever holds this
+    handle and hands the bytes on without reading them into Python:
+    send_to() uses sendfile(2) for sockets, move_to() renames (or kernel
+    copies) into place, and memoryview() maps the file read-only.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._mmap: Optional[Any] = None
+
+    @classmethod
+    def allocate(cls, suffix: str) -> "ResultHandle":
+        fd, path = tempfile.mkstemp(suffix=suffix, dir=_spool_dir())
+        os.close(fd)
+        return cls(path)
+
+    @property
+    def size(self) -> int:
+        return os.path.getsize(self.path)
+
+    def memoryview(self) -> memoryview:
+        """Read-only view of the output, backed by a memory map (no copy)."""
+        import mmap
+
+        if self.size == 0:
+            # mmap cannot map an empty file
+            return memoryview(b"")
+        if self._mmap is None:
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap)
+
+    def send_to(self, sock: socket.socket) -> int:
+        """Stream the output to a connected socket with sendfile(); returns bytes sent."""
+        with open(self.path, "rb") as f:
+            return sock.sendfile(f)
+
+    def move_to(self, destination: str) -> str:
+        """Move the output to ``destination`` (a rename when on the same filesystem)."""
+        self._close_mmap()
+        shutil.move(self.path, destination)
+        self.path = destination
+        return destination
+
+    def release(self) -> None:
+        """Delete the spool file (no-op once moved elsewhere with move_to())."""
+        self._close_mmap()
+        if os.path.dirname(self.path) == _spool_dir() and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _close_mmap(self) -> None:
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A caller still holds a memoryview; the map closes when it is dropped
+                pass
+            self._mmap = None
+
+    def __enter__(self) -> "ResultHandle":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
+def _job_process_entry(
+    kind: str,
+    html_content: Any,
+    source_path: Optional[str],
+    output_path: str,
+    options: Dict[str, Any],
+    conn,
+) -> None:
+    """Worker process body: run one converter and report stages over ``conn``."""
+    current = {"stage": "start"}
+
+    def on_stage(stage: str) -> None:
+        current["stage"] = stage
+        conn.send(("stage", stage))
+
+    try:
+        if source_path is not None:
+            with open(source_path, "r", encoding="utf-8") as f:
+                html_content = f.read()
+        options = dict(options)
+        if options.pop("profile", False):
+            if sys.platform != "win32":
+                # Unwind on the watchdog's SIGTERM so run_profiled() still
+                # writes the profile (Windows terminates without a signal)
+                signal.signal(signal.SIGTERM, _exit_on_sigterm)
+            result = run_profiled(_CONVERTERS[kind], html_content, output_path, on_stage=on_stage, **options)
+        else:
+            result = _CONVERTERS[kind](html_content, output_path, on_stage=on_stage, **options)
+        conn.send(("done", result))
+    except Exception as exc:
+        if _is_playwright_timeout(exc):
+            conn.send(("timeout", current["stage"]))
+        else:
+            crashed = any(marker in str(exc) for marker in _CRASH_MARKERS)
+            conn.send(("crash" if crashed else "error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def _exit_on_sigterm(signum: int, _frame) -> None:
+    raise SystemExit(128 + signum)
+
+
+def _is_playwright_timeout(exc: BaseException) -> bool:
+    try:
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+    except ImportError:
+        return False
+    return isinstance(exc, PlaywrightTimeoutError)
+
+
+class ConversionJob:
+    """A single conversion run in a child process under a watchdog.
+
+    The child process owns the Playwright driver and Chromium, so terminating
+    it on cancel or timeout tears the whole browser down with it. Renderer
+    crashes are retried up to ``max_retries`` times in a fresh process.
+
+    Pass ``source_path`` instead of ``html_content`` to have the worker read
+    the HTML from disk, so large documents never pass through the parent.
+    For the "bundle" kind, ``html_content`` is the list of documents.
+
+    With ``output_path=None`` the worker writes into a spool file and the
+    job's ``output`` is a ResultHandle for it; only the path ever crosses
+    the process boundary. The spool file is created when the job starts
+    running and removed if it fails.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        html_content: Any,
+        output_path: Optional[str],
+        options: Optional[Dict[str, Any]] = None,
+        stage_timeouts: Optional[Dict[str, float]] = None,
+        max_retries: int = 1,
+        token: Optional[CancelToken] = None,
+        source_path: Optional[str] = None,
+    ) -> None:
+        if kind not in _CONVERTERS:
+            raise ValueError(f"Unknown conversion kind: {kind}")
+        self.kind = kind
+        self.html_content = html_content
+        self.source_path = source_path
+        self.output: Optional[ResultHandle] = None
+        # Spooled jobs get their file in run(), so a job cancelled while
+        # still queued never leaves one behind
+        self._spool = output_path is None
+        self.output_path = output_path
+        self.options = dict(options or {})
+        self.stage_timeouts = dict(DEFAULT_STAGE_TIMEOUTS)
+        self.stage_timeouts.update(stage_timeouts or {})
+        self.max_retries = max(0, max_retries)
+        self.token = token or CancelToken()
+        self.stage = "pending"
+        self.attempts = 0
+        self.result: Any = None
+
+    def cancel(self) -> None:
+        self.token.cancel()
+
+    def run(self) -> Any:
+        """Run the job to completion, retrying renderer crashes.
+
+        Returns the converter's return value (also kept on ``result``).
+        Raises JobCancelled, JobTimeout, RendererCrashed (retries exhausted)
+        or ConversionFailed.
+        """
+        if self._spool and self.output is None:
+            self.output = ResultHandle.allocate(".pdf" if self.kind == "bundle" else f".{self.kind}")
+            self.output_path = self.output.path
+        try:
+            while True:
+                self.attempts += 1
+                try:
+                    self.result = self._run_once()
+                    return self.result
+                except RendererCrashed:
+                    if self.token.cancelled:
+                        raise JobCancelled()
+                    if self.attempts > self.max_retries:
+                        raise
+        except BaseException:
+            if self.output is not None:
+                self.output.release()
+            raise
+
+    def _run_once(self) -> Any:
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe(duplex=False)
+        # Playwright's own wait uses the same deadline, so a page that never
+        # reaches network idle surfaces as a timeout rather than a failure
+        options = dict(self.options, load_timeout=self.stage_timeouts.get("load"))
+        proc = ctx.Process(
+            target=_job_process_entry,
+            args=(self.kind, self.html_content, self.source_path, self.output_path, options, child_conn),
+            daemon=True,
+        )
+        grace = PROFILE_FLUSH_GRACE if self.options.get("profile") else 0.0
+        self.stage = "start"
+        stage_started = time.monotonic()
+        proc.start()
+        child_conn.close()
+        try:
+            while True:
+                if self.token.cancelled:
+                    raise JobCancelled()
+                limit = self.stage_timeouts.get(self.stage)
+                if limit is not None and time.monotonic() - stage_started > limit + grace:
+                    raise JobTimeout(self.stage, limit)
+                if not parent_conn.poll(0.2):
+                    continue
+                try:
+                    message, payload = parent_conn.recv()
+                except EOFError:
+                    proc.join(5)
+                    raise RendererCrashed(f"Worker exited unexpectedly (exit code {proc.exitcode})")
+                if message == "stage":
+                    self.stage = payload
+                    stage_started = time.monotonic()
+                elif message == "done":
+                    return payload
+                elif message == "timeout":
+                    raise JobTimeout(payload, self.stage_timeouts.get(payload, 0.0))
+                elif message == "crash":
+                    raise RendererCrashed(payload)
+                else:
+                    raise ConversionFailed(payload)
+        finally:
+            parent_conn.close()
+            if proc.is_alive():
+                proc.terminate()
+                # A profiled worker flushes its profile on SIGTERM before exiting
+                proc.join(5 + grace)
+                if proc.is_alive():
+                    proc.kill()
+            proc.join()
+
+
+# Scheduler priority classes; lower values are dispatched first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+_PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BULK: "bulk"}
+
+# Rough peak resident size of one headless Chromium render
+RENDER_MEMORY_BUDGET = 512 * 1024 * 1024
+
+
+def _total_memory_bytes() -> Optional[int]:
+    """Physical memory of this machine, or None if it cannot be determined."""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+
+            class _MemoryStatusEx(ctypes.Structure):
+                _fields_ = [
+                    ("dwLength", ctypes.c_ulong),
+                    ("dwMemoryLoad", ctypes.c_ulong),
+                    ("ullTotalPhys", ctypes.c_ulonglong),
+                    ("ullAvailPhys", ctypes.c_ulonglong),
+                    ("ullTotalPageFile", ctypes.c_ulonglong),
+                    ("ullAvailPageFile", ctypes.c_ulonglong),
+                    ("ullTotalVirtual", ctypes.c_ulonglong),
+                    ("ullAvailVirtual", ctypes.c_ulonglong),
+                    ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+                ]
+
+            status = _MemoryStatusEx()
+            status.dwLength = ctypes.sizeof(_MemoryStatusEx)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return int(status.ullTotalPhys)
+            return None
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def default_render_slots() -> int:
+    """Concurrent renders this machine can sustain: bounded by cores and memory."""
+    slots = os.cpu_count() or 1
+    memory = _total_memory_bytes()
+    if memory:
+        slots = min(slots, memory // RENDER_MEMORY_BUDGET)
+    return max(1, int(slots))
+
+
+class ConversionScheduler:
+    """Central queue that every conversion is submitted to.
+
+    At most ``max_concurrent`` jobs run at once. Interactive jobs are always
+    dispatched before bulk ones, and bulk jobs may never occupy the last slot
+    so an interactive request starts as soon as it arrives. Within a class,
+    submitters are served round-robin so one large batch cannot starve
+    another submitter's work.
+
+    Pass ``reserve_interactive=False`` where no interactive work can arrive
+    (e.g. a conversion server) to let bulk jobs use every slot.
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None, reserve_interactive: bool = True) -> None:
+        self.max_concurrent = max(1, max_concurrent or default_render_slots())
+        self.reserve_interactive = reserve_interactive
+        self._lock = threading.Lock()
+        # priority -> submitter -> queued (future, job, enqueued_at), in round-robin order
+        self._queues: Dict[int, Dict[str, list]] = {p: {} for p in _PRIORITY_NAMES}
+        self._running: Dict[int, int] = {p: 0 for p in _PRIORITY_NAMES}
+        self._completed: Dict[int, int] = {p: 0 for p in _PRIORITY_NAMES}
+        self._wait_total: Dict[int, float] = {p: 0.0 for p in _PRIORITY_NAMES}
+        self._wait_max: Dict[int, float] = {p: 0.0 for p in _PRIORITY_NAMES}
+        self._started: Dict[int, int] = {p: 0 for p in _PRIORITY_NAMES}
+
+    def submit(
+        self,
+        job: "ConversionJob",
+        priority: int = PRIORITY_INTERACTIVE,
+        submitter: str = "default",
+    ) -> Future:
+        """Queue ``job``; the returned future resolves to ``job.run()``'s result.
+
+        Cancelling the future drops a still-queued job; running jobs are
+        stopped through ``job.cancel()``.
+        """
+        if priority not in _PRIORITY_NAMES:
+            raise ValueError(f"Unknown priority: {priority}")
+        future: Future = Future()
+        with self._lock:
+            self._queues[priority].setdefault(submitter, []).append((future, job, time.monotonic()))
+            self._dispatch_locked()
+        return future
+
+    def queue_position(self, future: Future) -> int:
+        """Number of queued jobs dispatched before ``future`` (0 if running/done)."""
+        with self._lock:
+            ahead = 0
+            for priority in sorted(self._queues):
+                for entries in self._queues[priority].values():
+                    for index, (queued, _, _) in enumerate(entries):
+                        if queued is future:
+                            return ahead + index
+                    ahead += len(entries)
+        return 0
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, running count and wait times per priority class."""
+        with self._lock:
+            now = time.monotonic()
+            snapshot: Dict[str, Any] = {"max_concurrent": self.max_concurrent}
+            for priority, name in _PRIORITY_NAMES.items():
+                queued = [
+                    entry
+                    for entries in self._queues[priority].values()
+                    for entry in entries
+                    if not entry[0].cancelled()
+                ]
+                started = self._started[priority]
+                snapshot[name] = {
+                    "queued": len(queued),
+                    "running": self._running[priority],
+                    "completed": self._completed[priority],
+                    "avg_wait_s": (self._wait_total[priority] / started) if started else 0.0,
+                    "max_wait_s": self._wait_max[priority],
+                    "oldest_queued_s": max((now - entry[2] for entry in queued), default=0.0),
+                }
+            return snapshot
+
+    def _dispatch_locked(self) -> None:
+        while True:
+            running = sum(self._running.values())
+            if running >= self.max_concurrent:
+                return
+            entry = self._pop_next_locked(PRIORITY_INTERACTIVE)
+            priority = PRIORITY_INTERACTIVE
+            # Keep one slot free for interactive work whenever possible
+            reserved = 1 if self.reserve_interactive and self.max_concurrent > 1 else 0
+            if entry is None and running < self.max_concurrent - reserved:
+                entry = self._pop_next_locked(PRIORITY_BULK)
+                priority = PRIORITY_BULK
+            if entry is None:
+                return
+            future, job, enqueued_at = entry
+            if not future.set_running_or_notify_cancel():
+                continue
+            waited = time.monotonic() - enqueued_at
+            self._started[priority] += 1
+            self._wait_total[priority] += waited
+            self._wait_max[priority] = max(self._wait_max[priority], waited)
+            self._running[priority] += 1
+            threading.Thread(target=self._run, args=(future, job, priority), daemon=True).start()
+
+    def _pop_next_locked(self, priority: int):
+        queues = self._queues[priority]
+        while queues:
+            # Take from the submitter at the head, then rotate it to the back
+            submitter = next(iter(queues))
+            entries = queues.pop(submitter)
+            entry = entries.pop(0)
+            if entries:
+                queues[submitter] = entries
+            if not entry[0].cancelled():
+                return entry
+        return None
+
+    def _run(self, future: Future, job: "ConversionJob", priority: int) -> None:
+        try:
+            future.set_result(job.run())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                self._running[priority] -= 1
+                self._completed[priority] += 1
+                self._dispatch_locked()
+
+
+_scheduler: Optional[ConversionScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> ConversionScheduler:
+    """Process-wide scheduler shared by the GUI and headless entry points."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ConversionScheduler()
+        return _scheduler
+
+
+def _add_job_arguments(parser: argparse.ArgumentParser) -> None:
+    """Flags shared by the headless entry points that run a single job."""
+    parser.add_argument("--continuous", action="store_true", help="PDF only: render one tall page")
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="PDF only: deduplicate, recompress, downsample images and linearize",
+    )
+    parser.add_argument("--dpi", type=int, default=150, help="Image resolution cap for --optimize (0 keeps resolution)")
+    parser.add_argument("--policy", default=None, help="Request policy JSON file applied to every request")
+    parser.add_argument("--block-trackers", action="store_true", help="Block well-known analytics/tracking hosts")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Override every per-stage deadline (seconds)",
+    )
+    parser.add_argument("--retries", type=int, default=1, help="Retries after a renderer crash (default: 1)")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Save a Chromium trace and Python profile next to the output (<output>.profile/)",
+    )
+
+
+def _job_settings_from_args(
+    args: argparse.Namespace, pdf: bool
+) -> Tuple[Dict[str, Any], Optional[Dict[str, float]]]:
+    """Converter options and stage timeouts from _add_job_arguments() flags.
+
+    Raises OSError/ValueError if the request policy file cannot be loaded.
+    """
+    options: Dict[str, Any] = {}
+    if pdf:
+        options["continuous"] = args.continuous
+        options["optimize"] = args.optimize
+        options["target_dpi"] = args.dpi or None
+    request_policy: Dict[str, Any] = {}
+    if args.policy:
+        request_policy = load_request_policy(args.policy)
+    if args.block_trackers:
+        request_policy["block_trackers"] = True
+    if request_policy:
+        options["request_policy"] = request_policy
+    if args.profile:
+        options["profile"] = True
+    stage_timeouts = None
+    if args.timeout is not None:
+        stage_timeouts = {stage: args.timeout for stage in DEFAULT_STAGE_TIMEOUTS}
+    return options, stage_timeouts
+
+
+def _run_cli_job(job: ConversionJob) -> int:
+    """Run ``job`` through the scheduler and map its outcome to an EXIT_* code."""
+    # SIGTERM from a supervisor cancels the job cleanly (tearing down Chromium)
+    signal.signal(signal.SIGTERM, lambda _signum, _frame: job.cancel())
+
+    future = get_scheduler().submit(job, PRIORITY_INTERACTIVE, submitter="cli")
+    try:
+        try:
+            future.result()
+        except KeyboardInterrupt:
+            # Let the watchdog tear the worker down before exiting
+            job.cancel()
+            future.result()
+    except JobCancelled:
+        print("Conversion cancelled", file=sys.stderr)
+        return EXIT_CANCELLED
+    except JobTimeout as exc:
+        print(str(exc), file=sys.stderr)
+        return EXIT_TIMEOUT
+    except RendererCrashed as exc:
+        print(f"Renderer crashed after {job.attempts} attempt(s):\n{exc}", file=sys.stderr)
+        return EXIT_CRASHED
+    except ConversionFailed as exc:
+        print(exc.details, file=sys.stderr)
+        return EXIT_FAILED
+    print(f"Saved: {job.output_path}")
+    report = job.result or {}
+    if "requests" in report:
+        print(f"Requests: {format_request_stats(report['requests'])}")
+    if "optimize" in report:
+        print(f"Optimized: {format_optimize_report(report['optimize'])}")
+    if "profile" in report:
+        print(f"Profile: {report['profile']}")
+    return EXIT_OK
+
+
+def run_cli(argv: list[str]) -> int:
+    """Headless conversion entry point; returns one of the EXIT_* codes."""
+    parser = argparse.ArgumentParser(
+        prog="html_to_pdf_app.py --convert",
+        description="Convert an HTML file without starting the GUI.",
+    )
+    parser.add_argument("format", choices=DOCUMENT_FORMATS, help="Output format")
+    parser.add_argument("input", help="Input HTML file")
+    parser.add_argument("output", help="Output file path")
+    _add_job_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.input):
+        print(f"Could not read input: {args.input} is not a file", file=sys.stderr)
+        return EXIT_FAILED
+    try:
+        options, stage_timeouts = _job_settings_from_args(args, pdf=args.format == "pdf")
+    except (OSError, ValueError) as exc:
+        print(f"Invalid request policy: {exc}", file=sys.stderr)
+        return EXIT_USAGE
+    job = ConversionJob(
+        args.format,
+        "",
+        os.path.abspath(args.output),
+        options=options,
+        stage_timeouts=stage_timeouts,
+        max_retries=args.retries,
+        source_path=os.path.abspath(args.input),
+    )
+    return _run_cli_job(job)
+
+
+def run_bundle_cli(argv: list[str]) -> int:
+    """Bundle several HTML files into one PDF; returns one of the EXIT_* codes."""
+    parser = argparse.ArgumentParser(
+        prog="html_to_pdf_app.py --bundle",
+        description="Render many HTML files into a single PDF with a page-range index.",
+    )
+    parser.add_argument("output", help="Output PDF path")
+    parser.add_argument("inputs", nargs="+", help="Input HTML files, in order")
+    _add_job_arguments(parser)
+    args = parser.parse_args(argv)
+
+    missing = [path for path in args.inputs if not os.path.isfile(path)]
+    if missing:
+        print(f"Could not read input: {', '.join(missing)}", file=sys.stderr)
+        return EXIT_FAILED
+    try:
+        options, stage_timeouts = _job_settings_from_args(args, pdf=True)
+    except (OSError, ValueError) as exc:
+        print(f"Invalid request policy: {exc}", file=sys.stderr)
+        return EXIT_USAGE
+    documents = [
+        {"name": os.path.splitext(os.path.basename(path))[0], "path": os.path.abspath(path)}
+        for path in args.inputs
+    ]
+    output_path = os.path.abspath(args.output)
+    job = ConversionJob(
+        "bundle",
+        documents,
+        output_path,
+        options=options,
+        stage_timeouts=stage_timeouts,
+        max_retries=args.retries,
+    )
+    code = _run_cli_job(job)
+    if code == EXIT_OK:
+        index_path = os.path.splitext(output_path)[0] + ".index.json"
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(job.result["bundle"], f, indent=2)
+        print(f"Page index: {index_path}")
+    return code
+
+
+# ---------- Conversion server and batch coordinator ----------
+
+def _job_options_from_query(kind: str, query: Dict[str, list]) -> Dict[str, Any]:
+    """Converter options for a /convert request (mirrors the --convert flags)."""
+    def flag(name: str) -> bool:
+        return query.get(name, ["0"])[0].lower() in ("1", "true", "yes")
+
+    options: Dict[str, Any] = {}
+    if kind == "pdf":
+        options["continuous"] = flag("continuous")
+        options["optimize"] = flag("optimize")
+        dpi = int(query.get("dpi", ["150"])[0])
+        options["target_dpi"] = dpi or None
+    return options
+
+
+def start_conversion_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    scheduler: Optional[ConversionScheduler] = None,
+    request_policy: Optional[Dict[str, Any]] = None,
+) -> Tuple[http.server.ThreadingHTTPServer, int, threading.Thread]:
+    """Serve conversions over HTTP for a batch coordinator.
+
+    POST /convert?format=pdf[&continuous=1&optimize=1&dpi=N&timeout=S] takes
+    the HTML as the request body and answers with the converted file.
+    Failures map to 500 (conversion failed), 503 (renderer crashed) and
+    504 (timed out). The X-Conversion-Report response header carries the
+    converter's report (request counts, optimisation) as JSON.
+    ``request_policy`` applies to every job. GET /status reports the
+    scheduler's queue depth. Without a ``scheduler``, a dedicated one
+    without an interactive reservation is created, since every job
+    submitted here is bulk.
+    """
+    scheduler = scheduler or ConversionScheduler(reserve_interactive=False)
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args) -> None:  # silence
+            return
+
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):  # type: ignore[override]
+            if urllib.parse.urlsplit(self.path).path != "/status":
+                self.send_error(404)
+                return
+            metrics = scheduler.metrics()
+            classes = [metrics[name] for name in _PRIORITY_NAMES.values()]
+            self._send_json(
+                200,
+                {
+                    "queue_depth": sum(c["queued"] + c["running"] for c in classes),
+                    "max_concurrent": metrics["max_concurrent"],
+                    "metrics": metrics,
+                },
+            )
+
+        def do_POST(self):  # type: ignore[override]
+            url = urllib.parse.urlsplit(self.path)
+            if url.path != "/convert":
+                self.send_error(404)
+                return
+            query = urllib.parse.parse_qs(url.query)
+            kind = query.get("format", ["pdf"])[0]
+            try:
+                if kind not in DOCUMENT_FORMATS:
+                    raise ValueError(f"Unknown format: {kind}")
+                options = _job_options_from_query(kind, query)
+                if request_policy:
+                    options["request_policy"] = request_policy
+                stage_timeouts = None
+                if "timeout" in query:
+                    limit = float(query["timeout"][0])
+                    stage_timeouts = {stage: limit for stage in DEFAULT_STAGE_TIMEOUTS}
+                length = int(self.headers.get("Content-Length", "0"))
+                html = self.rfile.read(length).decode("utf-8")
+            except (ValueError, UnicodeDecodeError) as exc:
+                self._send_json(400, {"error": str(exc)})
+                return
+
+            submitter = self.headers.get("X-Submitter") or self.client_address[0]
+            # The worker writes into a spool file; only its handle comes back here
+            job = ConversionJob(kind, html, None, options=options, stage_timeouts=stage_timeouts)
+            future = scheduler.submit(job, PRIORITY_BULK, submitter=submitter)
+            try:
+                report = future.result()
+            except JobTimeout as exc:
+                self._send_json(504, {"error": str(exc)})
+                return
+            except RendererCrashed as exc:
+                self._send_json(503, {"error": str(exc)})
+                return
+            except ConversionFailed as exc:
+                self._send_json(500, {"error": str(exc), "details": exc.details})
+                return
+            except Exception as exc:
+                self._send_json(500, {"error": str(exc)})
+                return
+
+            with job.output:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(job.output.size))
+                self.send_header("X-Conversion-Report", json.dumps(report or {}))
+                self.end_headers()
+                # sendfile(): kernel copies spool file -> socket, no userspace buffer
+                self.wfile.flush()
+                job.output.send_to(self.connection)
+
+    httpd = http.server.ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    bound_port = httpd.server_address[1]
+    server_thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    server_thread.start()
+    return httpd, bound_port, server_thread
+
+
+class _WorkerUnavailable(Exception):
+    """A conversion could not be completed on a worker; retry it elsewhere."""
+
+
+class _JobRejected(Exception):
+    """A worker ran the job and it failed (HTTP 500) or was refused (4xx).
+
+    Those outcomes would repeat on any worker, so the job is not retried.
+    """
+
+
+def _normalize_worker_url(endpoint: str) -> str:
+    endpoint = endpoint.strip().rstrip("/")
+    if "://" not in endpoint:
+        endpoint = f"http://{endpoint}"
+    return endpoint
+
+
+def load_manifest(manifest_path: str) -> list[Dict[str, Any]]:
+    """Read a batch manifest: a JSON list of jobs, or an object with a "jobs" list.
+
+    Each job has "input" (HTML path, relative to the manifest) and "output"
+    (relative to the output directory); "format" defaults to the output's
+    extension, and "continuous", "optimize" and "dpi" apply to PDFs.
+    """
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    entries = data["jobs"] if isinstance(data, dict) else data
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    jobs = []
+    for entry in entries:
+        output = entry["output"]
+        kind = entry.get("format") or os.path.splitext(output)[1].lstrip(".").lower()
+        if kind not in DOCUMENT_FORMATS:
+            raise ValueError(f"Unknown format for {output}: {kind}")
+        jobs.append(
+            {
+                "input": os.path.join(base, entry["input"]),
+                "output": output,
+                "format": kind,
+                "continuous": bool(entry.get("continuous", False)),
+                "optimize": bool(entry.get("optimize", False)),
+                "dpi": int(entry.get("dpi", 150)),
+            }
+        )
+    return jobs
+
+
+class BatchCoordinator:
+    """Shard a batch of conversions across conversion servers.
+
+    Jobs are grouped into shards of ``shard_size``. Each shard goes to the
+    worker with the lowest load (its reported queue depth plus shards this
+    coordinator already has in flight there). If a worker cannot finish a
+    job (unreachable, renderer crash or timeout), the job and the rest of its
+    shard are retried on a different worker; a job that fails on
+    ``max_attempts`` workers is recorded as failed and the remainder of its
+    shard is requeued. A job the worker rejects or fails to convert (HTTP
+    4xx/500) is recorded as failed right away. Unreachable workers are
+    skipped for a while.
+    """
+
+    def __init__(
+        self,
+        workers: list[str],
+        shard_size: int = 4,
+        max_attempts: int = 3,
+        inflight_per_worker: int = 2,
+        request_timeout: float = 900.0,
+    ) -> None:
+        if not workers:
+            raise ValueError("At least one worker endpoint is required")
+        self.workers = [_normalize_worker_url(w) for w in workers]
+        self.shard_size = max(1, shard_size)
+        self.max_attempts = max(1, max_attempts)
+        self.inflight_per_worker = max(1, inflight_per_worker)
+        self.request_timeout = request_timeout
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, int] = {w: 0 for w in self.workers}
+        self._down_until: Dict[str, float] = {w: 0.0 for w in self.workers}
+        self._remote_depth: Dict[str, Tuple[int, float]] = {}
+
+    def run(self, jobs: list[Dict[str, Any]], out_dir: str) -> list[Dict[str, Any]]:
+        """Convert ``jobs`` into ``out_dir`` and write ``index.json`` there.
+
+        Returns one result entry per job, in manifest order.
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        results: list[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        shards: "queue.Queue[Any]" = queue.Queue()
+        for start in range(0, len(jobs), self.shard_size):
+            shards.put({"jobs": list(range(start, min(start + self.shard_size, len(jobs)))), "tried": set()})
+
+        def dispatcher() -> None:
+            while True:
+                shard = shards.get()
+                if shard is None:
+                    shards.task_done()
+                    return
+                try:
+                    self._run_shard(shard, jobs, results, out_dir, shards)
+                finally:
+                    shards.task_done()
+
+        threads = [
+            threading.Thread(target=dispatcher, daemon=True)
+            for _ in range(len(self.workers) * self.inflight_per_worker)
+        ]
+        for thread in threads:
+            thread.start()
+        shards.join()
+        for _ in threads:
+            shards.put(None)
+        for thread in threads:
+            thread.join()
+
+        index = {
+            "workers": self.workers,
+            "summary": {
+                "total": len(jobs),
+                "ok": sum(1 for r in results if r and r["status"] == "ok"),
+                "failed": sum(1 for r in results if r and r["status"] != "ok"),
+            },
+            "jobs": results,
+        }
+        with open(os.path.join(out_dir, "index.json"), "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+        return results  # type: ignore[return-value]
+
+    def _run_shard(self, shard, jobs, results, out_dir: str, shards) -> None:
+        worker = self._pick_worker(shard["tried"])
+        attempt = len(shard["tried"]) + 1
+        with self._lock:
+            self._inflight[worker] += 1
+        try:
+            for position, index in enumerate(shard["jobs"]):
+                job = jobs[index]
+                try:
+                    with open(job["input"], "rb") as f:
+                        body = f.read()
+                except OSError as exc:
+                    results[index] = self._result(job, "failed", worker, attempt, error=f"Could not read input: {exc}")
+                    continue
+                started = time.monotonic()
+                try:
+                    size, report = self._convert_on(worker, job, body, os.path.join(out_dir, job["output"]))
+                except _JobRejected as exc:
+                    results[index] = self._result(job, "failed", worker, attempt, error=str(exc))
+                    continue
+                except _WorkerUnavailable as exc:
+                    remaining = shard["jobs"][position:]
+                    if attempt < self.max_attempts:
+                        shards.put({"jobs": remaining, "tried": shard["tried"] | {worker}})
+                    else:
+                        # Give up on this job only; the rest of the shard starts afresh
+                        results[index] = self._result(job, "failed", worker, attempt, error=str(exc))
+                        if remaining[1:]:
+                            shards.put({"jobs": remaining[1:], "tried": set()})
+                    return
+                results[index] = self._result(
+                    job,
+                    "ok",
+                    worker,
+                    attempt,
+                    bytes=size,
+                    seconds=round(time.monotonic() - started, 3),
+                    report=report,
+                )
+        finally:
+            with self._lock:
+                self._inflight[worker] -= 1
+
+    @staticmethod
+    def _result(job: Dict[str, Any], status: str, worker: str, attempts: int, **extra: Any) -> Dict[str, Any]:
+        entry = {
+            "input": job["input"],
+            "output": job["output"],
+            "format": job["format"],
+            "status": status,
+            "worker": worker,
+            "attempts": attempts,
+        }
+        entry.update(extra)
+        return entry
+
+    def _pick_worker(self, exclude: set) -> str:
+        now = time.monotonic()
+        with self._lock:
+            up = [w for w in self.workers if self._down_until[w] <= now]
+        # Prefer healthy workers that haven't failed this shard yet
+        candidates = [w for w in up if w not in exclude] or up or list(self.workers)
+        loads = {w: self._remote_queue_depth(w) for w in candidates}
+        with self._lock:
+            return min(candidates, key=lambda w: (loads[w] + self._inflight[w], self._inflight[w]))
+
+    def _remote_queue_depth(self, worker: str) -> int:
+        cached = self._remote_depth.get(worker)
+        if cached is not None and time.monotonic() - cached[1] < 1.0:
+            return cached[0]
+        try:
+            with urllib.request.urlopen(f"{worker}/status", timeout=5) as resp:
+                depth = int(json.load(resp).get("queue_depth", 0))
+        except Exception:
+            self._mark_down(worker)
+            return sys.maxsize // 2
+        self._remote_depth[worker] = (depth, time.monotonic())
+        return depth
+
+    def _mark_down(self, worker: str, seconds: float = 10.0) -> None:
+        with self._lock:
+            self._down_until[worker] = time.monotonic() + seconds
+
+    def _convert_on(
+        self, worker: str, job: Dict[str, Any], body: bytes, output_path: str
+    ) -> Tuple[int, Dict[str, Any]]:
+        """POST one job to ``worker`` and stream the result to ``output_path``.
+
+        Returns the output size and the worker's conversion report.
+        """
+        query = {"format": job["format"]}
+        if job["format"] == "pdf":
+            query.update(
+                continuous=int(job["continuous"]), optimize=int(job["optimize"]), dpi=job["dpi"]
+            )
+        request = urllib.request.Request(
+            f"{worker}/convert?{urllib.parse.urlencode(query)}",
+            data=body,
+            method="POST",
+            headers={"Content-Type": "text/html; charset=utf-8", "X-Submitter": f"coordinator-{os.getpid()}"},
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        partial = output_path + ".part"
+        try:
+            with urllib.request.urlopen(request, timeout=self.request_timeout) as resp, open(partial, "wb") as out:
+                shutil.copyfileobj(resp, out)
+                report = json.loads(resp.headers.get("X-Conversion-Report") or "{}")
+            os.replace(partial, output_path)
+        except urllib.error.HTTPError as exc:
+            try:
+                message = json.load(exc).get("error", str(exc))
+            except Exception:
+                message = str(exc)
+            # 503 (renderer crashed), 504 (timed out) and proxy errors may
+            # succeed elsewhere; a failed conversion or bad request will not
+            if exc.code == 500 or 400 <= exc.code < 500:
+                raise _JobRejected(f"{worker}: HTTP {exc.code}: {message}") from exc
+            raise _WorkerUnavailable(f"{worker}: HTTP {exc.code}: {message}") from exc
+        except (urllib.error.URLError, OSError) as exc:
+            self._mark_down(worker)
+            raise _WorkerUnavailable(f"{worker}: {exc}") from exc
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+        return os.path.getsize(output_path), report
+
+
+def run_server_cli(argv: list[str]) -> int:
+    """Run a conversion server for a batch coordinator until interrupted."""
+    parser = argparse.ArgumentParser(
+        prog="html_to_pdf_app.py --serve",
+        description="Serve conversions over HTTP for --coordinate.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--slots", type=int, default=None, help="Concurrent renders (default: sized to this machine)")
+    parser.add_argument("--policy", default=None, help="Request policy JSON file applied to every job")
+    args = parser.parse_args(argv)
+
+    request_policy = None
+    if args.policy:
+        try:
+            request_policy = load_request_policy(args.policy)
+        except (OSError, ValueError) as exc:
+            print(f"Invalid request policy: {exc}", file=sys.stderr)
+            return EXIT_USAGE
+    scheduler = ConversionScheduler(args.slots, reserve_interactive=False)
+    httpd, port, thread = start_conversion_server(args.host, args.port, scheduler, request_policy)
+    print(f"Serving conversions on http://{args.host}:{port} ({scheduler.max_concurrent} slots)")
+    try:
+        while thread.is_alive():
+            thread.join(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    return EXIT_OK
+
+
+def run_coordinator_cli(argv: list[str]) -> int:
+    """Shard a manifest across conversion servers; EXIT_FAILED if any job failed."""
+    parser = argparse.ArgumentParser(
+        prog="html_to_pdf_app.py --coordinate",
+        description="Distribute a batch manifest across --serve instances.",
+    )
+    parser.add_argument("manifest", help="JSON manifest of jobs")
+    parser.add_argument("--workers", required=True, help="Comma-separated worker endpoints (host:port)")
+    parser.add_argument("--out", default="out", help="Output directory (default: ./out)")
+    parser.add_argument("--shard-size", type=int, default=4, help="Jobs per shard (default: 4)")
+    parser.add_argument("--attempts", type=int, default=3, help="Workers to try per shard (default: 3)")
+    parser.add_argument("--inflight", type=int, default=2, help="Shards in flight per worker (default: 2)")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = load_manifest(args.manifest)
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"Invalid manifest: {exc}", file=sys.stderr)
+        return EXIT_USAGE
+    coordinator = BatchCoordinator(
+        args.workers.split(","),
+        shard_size=args.shard_size,
+        max_attempts=args.attempts,
+        inflight_per_worker=args.inflight,
+    )
+    results = coordinator.run(jobs, args.out)
+    failed = [r for r in results if r["status"] != "ok"]
+    print(f"{len(results) - len(failed)}/{len(results)} converted; index: {os.path.join(args.out, 'index.json')}")
+    for result in failed:
+        print(f"FAILED {result['input']}: {result.get('error')}", file=sys.stderr)
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+# A4 at 96 CSS px per inch; paged previews are laid out at this width
+A4_WIDTH_PX = 794
+A4_HEIGHT_PX = 1123
+PREVIEW_THUMBNAIL_WIDTH = 240
+PREVIEW_CACHE_PAGES = 256
+
+# Per-page fingerprints for the preview: a hash of every element box that
+# intersects the page (tag, all attributes, live form state, geometry and
+# the computed styles that change appearance without moving anything) and
+# of every text line box on it (position and text), plus one hash of the
+# document's stylesheets and root attributes, which invalidates every page
+# when it changes. Pages holding content drawn outside the DOM (canvas,
+# SVG, media, frames) are "volatile" and never served from the cache.
+_PAGE_FINGERPRINT_JS = """
+(pageHeight) => {
+  const hash = (str, seed = 0) => {
+    let h1 = 0xdeadbeef ^ seed, h2 = 0x41c6ce57 ^ seed;
+    for (let i = 0; i < str.length; i++) {
+      const ch = str.charCodeAt(i);
+      h1 = Math.imul(h1 ^ ch, 2654435761);
+      h2 = Math.imul(h2 ^ ch, 1597334677);
+    }
+    h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+    h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+    return (4294967296 * (2097151 & h2) + (h1 >>> 0)).toString(36);
+  };
+  const el = document.documentElement;
+  const body = document.body;
+  const width = Math.max(el.scrollWidth, el.offsetWidth, body?.scrollWidth||0, body?.offsetWidth||0);
+  const height = Math.max(el.scrollHeight, el.offsetHeight, body?.scrollHeight||0, body?.offsetHeight||0);
+  const count = Math.max(1, Math.ceil(height / pageHeight));
+  const pages = Array.from({ length: count }, () => []);
+  const sheets = Array.from(document.querySelectorAll("style, link[rel=stylesheet]"))
+    .map((s) => s.outerHTML).join("");
+  const root = [el, body].map((n) => n ? n.cloneNode(false).outerHTML : "").join("");
+  const styles = [
+    "color", "backgroundColor", "backgroundImage", "opacity", "visibility", "borderColor",
+    "fontFamily", "fontWeight", "fontStyle", "textDecorationLine", "boxShadow", "transform",
+    "filter", "fill", "stroke",
+  ];
+  const volatileTags = new Set(["CANVAS", "SVG", "VIDEO", "IFRAME", "OBJECT", "EMBED"]);
+  const volatile = new Array(count).fill(false);
+  const place = (top, bottom, sig, isVolatile) => {
+    const first = Math.max(0, Math.floor(top / pageHeight));
+    const last = Math.min(count - 1, Math.floor(Math.max(top, bottom - 1) / pageHeight));
+    for (let i = first; i <= last; i++) {
+      pages[i].push(sig);
+      volatile[i] = volatile[i] || isVolatile;
+    }
+  };
+  const range = document.createRange();
+  for (const node of body ? [body, ...body.querySelectorAll("*")] : []) {
+    // Text is placed by its own line boxes, so text directly inside <body>
+    // (or in a parent spanning pages) lands on the pages it is drawn on
+    for (const child of node.childNodes) {
+      if (child.nodeType !== 3 || !child.data.trim()) continue;
+      range.selectNodeContents(child);
+      for (const r of range.getClientRects()) {
+        const top = r.top + window.scrollY;
+        const sig = ["#text", Math.round(r.left), Math.round(top), Math.round(r.width), child.data].join("|");
+        place(top, r.bottom + window.scrollY, sig, false);
+      }
+    }
+    // The body's box spans every page; its attributes are in the document hash
+    if (node === body) continue;
+    const r = node.getBoundingClientRect();
+    if (!r.width && !r.height) continue;
+    const top = r.top + window.scrollY;
+    const attrs = Array.from(node.attributes, (a) => a.name + "=" + a.value).join(" ");
+    const computed = getComputedStyle(node);
+    const sig = [
+      node.tagName, attrs, "value" in node ? node.value : "", node.checked,
+      Math.round(r.left), Math.round(top), Math.round(r.width), Math.round(r.height),
+      ...styles.map((name) => computed[name]),
+    ].join("|");
+    place(top, r.bottom + window.scrollY, sig, volatileTags.has(node.tagName.toUpperCase()));
+  }
+  return {
+    width, height, document: hash(sheets + root),
+    pages: pages.map((p, i) => ({ hash: hash(p.join("\\n")), volatile: volatile[i] })),
+  };
+}
+"""
+
+
+class PreviewRenderer:
+    """Keeps one headless Chromium page warm and renders page thumbnails.
+
+    Uses the same engine, media emulation and request policy as the PDF
+    converter. Paged mode lays the document out at A4 width and cuts it into
+    A4-tall pages; continuous mode cuts the single tall page into tiles of
+    the same aspect ratio. Only pages whose fingerprint is not in the cache
+    are screenshotted, so an edit re-renders just the pages it touched.
+
+    Playwright objects are bound to the thread that created them, so all
+    rendering happens on one background thread. request() never blocks:
+    a newer request replaces one that has not started yet, and ``callback``
+    is invoked on the render thread with a result dict:
+      pages: list of (fingerprint, png_bytes) in page order
+      rendered: how many pages were screenshotted (cache misses)
+      elapsed_s: render time, or "error" with a message on failure
+    """
+
+    def __init__(self, request_policy: Optional[Dict[str, Any]] = None) -> None:
+        self.request_policy = request_policy
+        self._cache: "collections.OrderedDict[str, bytes]" = collections.OrderedDict()
+        self._pending: Optional[Tuple[Any, ...]] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._renders = 0
+
+    def request(
+        self,
+        html_content: str,
+        continuous: bool,
+        callback: Callable[[Dict[str, Any]], None],
+        source_path: Optional[str] = None,
+    ) -> None:
+        """Queue a render of ``html_content`` (or the file at ``source_path``)."""
+        with self._lock:
+            self._pending = (html_content, source_path, continuous, callback)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="preview-renderer", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def close(self) -> None:
+        """Stop the render thread; the browser is closed once it finishes."""
+        self._closed = True
+        self._wake.set()
+
+    def _next_request(self) -> Optional[Tuple[Any, ...]]:
+        while not self._closed:
+            self._wake.wait()
+            with self._lock:
+                self._wake.clear()
+                pending, self._pending = self._pending, None
+            if pending is not None:
+                return pending
+        return None
+
+    def _run(self) -> None:
+        from playwright.sync_api import sync_playwright
+
+        _ensure_playwright_browsers()
+        with sync_playwright() as p:
+            browser = None
+            page = None
+            while True:
+                pending = self._next_request()
+                if pending is None:
+                    break
+                html_content, source_path, continuous, callback = pending
+                started = time.perf_counter()
+                try:
+                    if browser is None or not browser.is_connected():
+                        browser = p.chromium.launch(headless=True)
+                        page = browser.new_context().new_page()
+                        RequestPolicy(self.request_policy).install(page)
+                        page.emulate_media(media="screen")
+                    if source_path is not None:
+                        with open(source_path, "r", encoding="utf-8", errors="replace") as f:
+                            html_content = f.read()
+                    result = self._render(page, html_content, continuous)
+                    result["elapsed_s"] = round(time.perf_counter() - started, 3)
+                except Exception as exc:
+                    # Drop the page so the next request starts from a fresh browser
+                    if browser is not None:
+                        try:
+                            browser.close()
+                        except Exception:
+                            pass
+                    browser = None
+                    result = {"error": f"{type(exc).__name__}: {exc}"}
+                callback(result)
+            if browser is not None:
+                browser.close()
+
+    def _render(self, page, html_content: str, continuous: bool) -> Dict[str, Any]:
+        width = 1280 if continuous else A4_WIDTH_PX
+        page.set_viewport_size({"width": width, "height": 720 if continuous else A4_HEIGHT_PX})
+        page.set_content(html_content, wait_until="networkidle")
+
+        page_height = round(width * A4_HEIGHT_PX / A4_WIDTH_PX)
+        layout = page.evaluate(_PAGE_FINGERPRINT_JS, page_height)
+        mode = "continuous" if continuous else "paged"
+        pages = []
+        rendered = 0
+        self._renders += 1
+        for index, entry in enumerate(layout["pages"]):
+            key = f"{mode}:{layout['width']}:{layout['document']}:{index}:{entry['hash']}"
+            if entry["volatile"]:
+                # Canvas/SVG/media content is invisible to the fingerprint
+                key += f":{self._renders}"
+            png = self._cache.get(key)
+            if png is None:
+                top = index * page_height
+                height = max(1, min(page_height, layout["height"] - top))
+                clip = {"x": 0, "y": top, "width": layout["width"], "height": height}
+                png = _thumbnail_png(page.screenshot(clip=clip, full_page=True, type="png"))
+                if not entry["volatile"]:
+                    self._cache[key] = png
+                rendered += 1
+            if key in self._cache:
+                self._cache.move_to_end(key)
+            pages.append((key, png))
+        while len(self._cache) > PREVIEW_CACHE_PAGES:
+            self._cache.popitem(last=False)
+        return {"pages": pages, "rendered": rendered}
+
+
+def _thumbnail_png(png_bytes: bytes) -> bytes:
+    """Scale a page screenshot down to PREVIEW_THUMBNAIL_WIDTH."""
+    import io
+    from PIL import Image
+
+    with Image.open(io.BytesIO(png_bytes)) as image:
+        height = max(1, round(image.height * PREVIEW_THUMBNAIL_WIDTH / image.width))
+        thumb = image.convert("RGB").resize((PREVIEW_THUMBNAIL_WIDTH, height), Image.LANCZOS)
+    out = io.BytesIO()
+    thumb.save(out, format="PNG", optimize=False)
+    return out.getvalue()
+
+
+# Files above this size open in large-file mode (chunked load, lazy sync,
+# visible-region highlighting) and may be converted straight from disk
+LARGE_FILE_THRESHOLD = 1024 * 1024
+LOAD_CHUNK_BYTES = 256 * 1024
+# Large files are autosaved on a timer instead of after every pause in typing
+LARGE_FILE_AUTOSAVE_MS = 30 * 1000
 
 
 class HtmlToPdfApp(ctk.CTk):
@@ -238,6 +2386,7 @@ class HtmlToPdfApp(ctk.CTk):
 
         # Layout configuration
         self.grid_columnconfigure(0, weight=1)
+        self.grid_columnconfigure(1, weight=0)
         self.grid_rowconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=0)
 
@@ -245,9 +2394,14 @@ class HtmlToPdfApp(ctk.CTk):
         self.html_text = ctk.CTkTextbox(self, wrap="word")
         self.html_text.grid(row=0, column=0, padx=16, pady=(16, 8), sticky="nsew")
 
+        # Rendered page thumbnails (shown by the "Page preview" toggle)
+        self.page_preview_frame = ctk.CTkScrollableFrame(
+            self, width=PREVIEW_THUMBNAIL_WIDTH + 16, label_text="Pages"
+        )
+
         # Bottom bar frame
         bottom = ctk.CTkFrame(self)
-        bottom.grid(row=1, column=0, padx=16, pady=(0, 16), sticky="ew")
+        bottom.grid(row=1, column=0, columnspan=2, padx=16, pady=(0, 16), sticky="ew")
         bottom.grid_columnconfigure(0, weight=1)
         bottom.grid_columnconfigure(1, weight=0)
         bottom.grid_columnconfigure(2, weight=0)
@@ -256,6 +2410,10 @@ class HtmlToPdfApp(ctk.CTk):
         bottom.grid_columnconfigure(5, weight=0)
         bottom.grid_columnconfigure(6, weight=0)
         bottom.grid_columnconfigure(7, weight=0)
+        bottom.grid_columnconfigure(8, weight=0)
+        bottom.grid_columnconfigure(9, weight=0)
+        bottom.grid_columnconfigure(10, weight=0)
+        bottom.grid_columnconfigure(11, weight=0)
 
         # Status label
         self.status_var = ctk.StringVar(value="Ready")
@@ -275,22 +2433,46 @@ class HtmlToPdfApp(ctk.CTk):
             bottom,
             values=["Pages", "Continuous"],
             variable=self.paging_var,
+            command=self._on_paging_changed,
         )
         self.paging_toggle.grid(row=0, column=3, padx=12, pady=12, sticky="e")
 
+        # Post-process PDFs (dedup, recompress, downsample, linearize)
+        self.optimize_var = ctk.BooleanVar(value=False)
+        self.optimize_check = ctk.CTkCheckBox(bottom, text="Optimize PDF", variable=self.optimize_var)
+        self.optimize_check.grid(row=0, column=4, padx=12, pady=12, sticky="e")
+
+        # Save a Chromium trace + Python profile next to the output
+        self.profile_var = ctk.BooleanVar(value=False)
+        self.profile_check = ctk.CTkCheckBox(bottom, text="Profile", variable=self.profile_var)
+        self.profile_check.grid(row=0, column=5, padx=12, pady=12, sticky="e")
+
         # Preview button
         self.preview_btn = ctk.CTkButton(bottom, text="Preview HTML", command=self.on_preview_click)
-        self.preview_btn.grid(row=0, column=4, padx=12, pady=12, sticky="e")
+        self.preview_btn.grid(row=0, column=6, padx=12, pady=12, sticky="e")
+
+        # In-app page thumbnails rendered by the conversion engine
+        self.page_preview_var = ctk.BooleanVar(value=False)
+        self.page_preview_check = ctk.CTkCheckBox(
+            bottom, text="Page preview", variable=self.page_preview_var, command=self.on_page_preview_toggle
+        )
+        self.page_preview_check.grid(row=0, column=7, padx=12, pady=12, sticky="e")
 
         # Convert buttons
         self.convert_btn = ctk.CTkButton(bottom, text="Convert to PDF", command=self.on_convert_click)
-        self.convert_btn.grid(row=0, column=5, padx=12, pady=12, sticky="e")
+        self.convert_btn.grid(row=0, column=8, padx=12, pady=12, sticky="e")
 
         self.convert_docx_btn = ctk.CTkButton(bottom, text="Convert to DOCX", command=self.on_convert_docx_click)
-        self.convert_docx_btn.grid(row=0, column=6, padx=12, pady=12, sticky="e")
+        self.convert_docx_btn.grid(row=0, column=9, padx=12, pady=12, sticky="e")
 
         self.convert_pptx_btn = ctk.CTkButton(bottom, text="Convert to PPTX", command=self.on_convert_pptx_click)
-        self.convert_pptx_btn.grid(row=0, column=7, padx=12, pady=12, sticky="e")
+        self.convert_pptx_btn.grid(row=0, column=10, padx=12, pady=12, sticky="e")
+
+        # Cancel running conversions
+        self.cancel_btn = ctk.CTkButton(
+            bottom, text="Cancel", command=self.on_cancel_click, state="disabled", fg_color="#b91c1c"
+        )
+        self.cancel_btn.grid(row=0, column=11, padx=12, pady=12, sticky="e")
 
         # Example placeholder
         self._insert_example_placeholder()
@@ -301,9 +2483,24 @@ class HtmlToPdfApp(ctk.CTk):
         self._debounce_job: Optional[str] = None
         self._highlight_job: Optional[str] = None
         self._current_file: Optional[str] = None
+        self._active_jobs: Dict[ConversionJob, Future] = {}
+        # Large-file state: lazy buffer sync, background load, convert-from-disk source
+        self._large_file_mode = False
+        self._editor_dirty = False
+        self._loading = False
+        self._source_file: Optional[str] = None
+        self._autosave_job: Optional[str] = None
+        # Page preview: warm renderer, pending debounce, thumbnails by fingerprint
+        self._preview_renderer: Optional[PreviewRenderer] = None
+        self._page_preview_job: Optional[str] = None
+        self._page_labels: list = []
+        self._page_images: Dict[str, Any] = {}
 
         # Debounced change binding for live preview
         self.html_text.bind("<<Modified>>", self._on_text_modified)
+        # Large-file mode only highlights the visible region, so refresh on scroll
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>", "<KeyRelease>", "<ButtonRelease-1>"):
+            self.html_text.bind(sequence, self._on_editor_scrolled, add="+")
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # Configure syntax highlight tags
@@ -330,7 +2527,7 @@ class HtmlToPdfApp(ctk.CTk):
         )
         self.html_text.insert("1.0", placeholder)
 
-    def _session_path(self) -> str:
+    def _config_dir(self) -> str:
         if sys.platform == "win32":
             base = os.path.join(os.environ.get("APPDATA", ""), "HTML-to-PDF Converter")
         elif sys.platform == "darwin":
@@ -338,12 +2535,32 @@ class HtmlToPdfApp(ctk.CTk):
         else:
             base = os.path.expanduser("~/.config/HTML-to-PDF Converter")
         os.makedirs(base, exist_ok=True)
-        return os.path.join(base, "last_session.html")
+        return base
+
+    def _session_path(self) -> str:
+        return os.path.join(self._config_dir(), "last_session.html")
+
+    def _job_options(self) -> Dict[str, Any]:
+        """Converter options shared by every format: request policy and profiling."""
+        options: Dict[str, Any] = {}
+        if self.profile_var.get():
+            options["profile"] = True
+        path = os.path.join(self._config_dir(), "request_policy.json")
+        if not os.path.isfile(path):
+            return options
+        try:
+            options["request_policy"] = load_request_policy(path)
+        except (OSError, ValueError) as exc:
+            messagebox.showwarning("Request policy", f"Ignoring {path}:\n\n{exc}")
+        return options
 
     def _load_last_session(self) -> None:
         try:
             path = self._session_path()
             if os.path.isfile(path):
+                if os.path.getsize(path) > LARGE_FILE_THRESHOLD:
+                    self._load_file_in_chunks(path, "Restored last session")
+                    return
                 with open(path, "r", encoding="utf-8") as f:
                     data = f.read()
                 if data.strip():
@@ -376,21 +2593,37 @@ class HtmlToPdfApp(ctk.CTk):
                 pass
         self._highlight_job = self.after(150, self._apply_syntax_highlighting)
 
+    def _on_editor_scrolled(self, _event=None) -> None:
+        if self._large_file_mode:
+            self._schedule_highlight()
+
     def _apply_syntax_highlighting(self) -> None:
         text_widget = self.html_text
-        content = text_widget.get("1.0", "end-1c")
+        if self._loading or self._source_file is not None:
+            return
+        if self._large_file_mode:
+            # Only the visible lines plus a margin; copying and scanning the
+            # whole buffer on every pass is what makes large files lag
+            start = text_widget.index("@0,0 linestart - 100 lines")
+            end = text_widget.index(f"@0,{text_widget.winfo_height()} lineend + 100 lines")
+        else:
+            start, end = "1.0", "end-1c"
+        content = text_widget.get(start, end)
 
         # Clear previous tags
         for tag in ("html-comment", "html-tag", "html-attr", "html-string"):
-            text_widget.tag_remove(tag, "1.0", "end")
+            text_widget.tag_remove(tag, start, end)
+
+        # Helper to convert an offset into ``content`` to a Tk index
+        base_line, base_col = (int(part) for part in text_widget.index(start).split("."))
+        line_starts = [0] + [m.end() for m in re.finditer("\n", content)]
 
-        # Helper to convert absolute offset to Tk index
         def to_index(offset: int) -> str:
-            # Compute line/column by counting newlines
-            upto = content[:offset]
-            line = upto.count("\n") + 1
-            col = len(upto) - (upto.rfind("\n") + 1 if "\n" in upto else 0)
-            return f"{line}.{col}"
+            line = bisect.bisect_right(line_starts, offset) - 1
+            col = offset - line_starts[line]
+            if line == 0:
+                col += base_col
+            return f"{base_line + line}.{col}"
 
         # Comments
         for m in re.finditer(r"<!--[\s\S]*?-->", content):
@@ -407,11 +2640,28 @@ class HtmlToPdfApp(ctk.CTk):
         for m in re.finditer(r"\s([a-zA-Z_:][-a-zA-Z0-9_:.]*)\s*=", content):
             text_widget.tag_add("html-attr", to_index(m.start(1)), to_index(m.end(1)))
 
-    def on_convert_click(self) -> None:
+    def _editor_source(self) -> Optional[Tuple[str, Optional[str]]]:
+        """Return (html, source_path) for a conversion, or None if not ready.
+
+        When a large file is being converted from disk, ``html`` is empty and
+        ``source_path`` points at the file the worker should read.
+        """
+        if self._loading:
+            self.status_var.set("Still loading the file, please wait...")
+            return None
+        if self._source_file is not None:
+            return "", self._source_file
         html = self.html_text.get("1.0", "end-1c").strip()
         if not html:
             messagebox.showinfo("No HTML", "Please paste HTML content before converting.")
+            return None
+        return html, None
+
+    def on_convert_click(self) -> None:
+        source = self._editor_source()
+        if source is None:
             return
+        html, source_path = source
 
         output_path = filedialog.asksaveasfilename(
             title="Save PDF As...",
@@ -423,35 +2673,19 @@ class HtmlToPdfApp(ctk.CTk):
         if not output_path:
             return
 
-        # Disable button and update status
-        self.convert_btn.configure(state="disabled")
-        self.status_var.set("Converting...")
-
-        def worker() -> None:
-            error_msg: Optional[str] = None
-            try:
-                continuous = self.paging_var.get() == "Continuous"
-                convert_html_to_pdf_sync(html, output_path, continuous=continuous)
-            except Exception:
-                error_msg = traceback.format_exc()
-
-            def finalize() -> None:
-                if error_msg is None:
-                    self.status_var.set("PDF saved successfully!")
-                else:
-                    self.status_var.set("Conversion failed. See details in alert.")
-                    messagebox.showerror("Error", f"An error occurred during conversion:\n\n{error_msg}")
-                self.convert_btn.configure(state="normal")
-
-            self.after(0, finalize)
-
-        threading.Thread(target=worker, daemon=True).start()
+        options = {
+            "continuous": self.paging_var.get() == "Continuous",
+            "optimize": bool(self.optimize_var.get()),
+            **self._job_options(),
+        }
+        job = ConversionJob("pdf", html, output_path, options=options, source_path=source_path)
+        self._start_job(job, self.convert_btn, "PDF")
 
     def on_convert_docx_click(self) -> None:
-        html = self.html_text.get("1.0", "end-1c").strip()
-        if not html:
-            messagebox.showinfo("No HTML", "Please paste HTML content before converting.")
+        source = self._editor_source()
+        if source is None:
             return
+        html, source_path = source
 
         output_path = filedialog.asksaveasfilename(
             title="Save DOCX As...",
@@ -463,33 +2697,14 @@ class HtmlToPdfApp(ctk.CTk):
         if not output_path:
             return
 
-        self.convert_docx_btn.configure(state="disabled")
-        self.status_var.set("Converting to DOCX...")
-
-        def worker() -> None:
-            error_msg: Optional[str] = None
-            try:
-                convert_html_to_docx_sync(html, output_path)
-            except Exception:
-                error_msg = traceback.format_exc()
-
-            def finalize() -> None:
-                if error_msg is None:
-                    self.status_var.set("DOCX saved successfully!")
-                else:
-                    self.status_var.set("DOCX conversion failed. See details in alert.")
-                    messagebox.showerror("Error", f"An error occurred during conversion:\n\n{error_msg}")
-                self.convert_docx_btn.configure(state="normal")
-
-            self.after(0, finalize)
-
-        threading.Thread(target=worker, daemon=True).start()
+        job = ConversionJob("docx", html, output_path, options=self._job_options(), source_path=source_path)
+        self._start_job(job, self.convert_docx_btn, "DOCX")
 
     def on_convert_pptx_click(self) -> None:
-        html = self.html_text.get("1.0", "end-1c").strip()
-        if not html:
-            messagebox.showinfo("No HTML", "Please paste HTML content before converting.")
+        source = self._editor_source()
+        if source is None:
             return
+        html, source_path = source
 
         output_path = filedialog.asksaveasfilename(
             title="Save PPTX As...",
@@ -501,33 +2716,86 @@ class HtmlToPdfApp(ctk.CTk):
         if not output_path:
             return
 
-        self.convert_pptx_btn.configure(state="disabled")
-        self.status_var.set("Converting to PPTX...")
+        job = ConversionJob("pptx", html, output_path, options=self._job_options(), source_path=source_path)
+        self._start_job(job, self.convert_pptx_btn, "PPTX")
+
+    def _start_job(self, job: ConversionJob, button: ctk.CTkButton, label: str) -> None:
+        """Submit ``job`` to the scheduler, keeping ``button`` disabled until it ends."""
+        button.configure(state="disabled")
+        self.cancel_btn.configure(state="normal")
+        scheduler = get_scheduler()
+        future = scheduler.submit(job, PRIORITY_INTERACTIVE, submitter="gui")
+        self._active_jobs[job] = future
+        if future.running() or future.done():
+            self.status_var.set(f"Converting to {label}...")
+        else:
+            ahead = scheduler.queue_position(future)
+            self.status_var.set(f"{label} conversion queued ({ahead} ahead)...")
 
-        def worker() -> None:
+        def on_done(done: Future) -> None:
+            outcome = "ok"
             error_msg: Optional[str] = None
             try:
-                convert_html_to_pptx_sync(html, output_path)
+                done.result()
+            except (JobCancelled, CancelledError):
+                outcome = "cancelled"
+            except JobTimeout as exc:
+                outcome = "timeout"
+                error_msg = str(exc)
+            except ConversionFailed as exc:
+                outcome = "failed"
+                error_msg = exc.details
             except Exception:
+                outcome = "failed"
                 error_msg = traceback.format_exc()
 
             def finalize() -> None:
-                if error_msg is None:
-                    self.status_var.set("PPTX saved successfully!")
+                self._active_jobs.pop(job, None)
+                if not self._active_jobs:
+                    self.cancel_btn.configure(state="disabled")
+                if outcome == "ok":
+                    report = job.result or {}
+                    message = f"{label} saved successfully!"
+                    blocked = sum(report.get("requests", {}).get(k, 0) for k in ("blocked", "substituted"))
+                    if blocked:
+                        message += f" ({blocked} requests blocked)"
+                    if "optimize" in report:
+                        message = f"{label} saved and optimized: {format_optimize_report(report['optimize'])}"
+                    if "profile" in report:
+                        message += f" Profile: {report['profile']}"
+                    self.status_var.set(message)
+                elif outcome == "cancelled":
+                    self.status_var.set(f"{label} conversion cancelled.")
+                elif outcome == "timeout":
+                    self.status_var.set(f"{label} conversion timed out.")
+                    messagebox.showerror("Timeout", error_msg)
                 else:
-                    self.status_var.set("PPTX conversion failed. See details in alert.")
+                    self.status_var.set(f"{label} conversion failed. See details in alert.")
                     messagebox.showerror("Error", f"An error occurred during conversion:\n\n{error_msg}")
-                self.convert_pptx_btn.configure(state="normal")
+                button.configure(state="normal")
 
             self.after(0, finalize)
 
-        threading.Thread(target=worker, daemon=True).start()
+        future.add_done_callback(on_done)
+
+    def on_cancel_click(self) -> None:
+        if not self._active_jobs:
+            return
+        for job, future in list(self._active_jobs.items()):
+            future.cancel()
+            job.cancel()
+        self.status_var.set("Cancelling...")
 
     def on_preview_click(self) -> None:
-        html = self.html_text.get("1.0", "end-1c").strip()
-        if not html:
-            messagebox.showinfo("No HTML", "Please paste HTML content to preview.")
+        if self._loading:
+            self.status_var.set("Still loading the file, please wait...")
             return
+        if self._source_file is None:
+            self._editor_dirty = True
+            self._sync_latest_html()
+            if not self._latest_html.strip():
+                messagebox.showinfo("No HTML", "Please paste HTML content to preview.")
+                return
         # Start live preview server (once) and open browser
         try:
             if self._preview_server is None:
@@ -539,6 +2807,93 @@ class HtmlToPdfApp(ctk.CTk):
             self.status_var.set("Failed to open preview")
             messagebox.showerror("Error", f"Could not open preview:\n\n{exc}")
 
+    # ---------- Page preview ----------
+    def on_page_preview_toggle(self) -> None:
+        if self.page_preview_var.get():
+            self.page_preview_frame.grid(row=0, column=1, padx=(0, 16), pady=(16, 8), sticky="ns")
+            if self._preview_renderer is None:
+                policy = self._job_options().get("request_policy")
+                self._preview_renderer = PreviewRenderer(request_policy=policy)
+            self._schedule_page_preview(delay=0)
+        else:
+            self.page_preview_frame.grid_remove()
+            if self._page_preview_job is not None:
+                self.after_cancel(self._page_preview_job)
+                self._page_preview_job = None
+
+    def _on_paging_changed(self, _value=None) -> None:
+        self._schedule_page_preview(delay=0)
+
+    def _schedule_page_preview(self, delay: Optional[int] = None) -> None:
+        """Debounce a thumbnail refresh; a no-op while the pane is hidden."""
+        if not self.page_preview_var.get():
+            return
+        if self._page_preview_job is not None:
+            try:
+                self.after_cancel(self._page_preview_job)
+            except Exception:
+                pass
+        if delay is None:
+            delay = 1500 if self._large_file_mode else 600
+        self._page_preview_job = self.after(delay, self._refresh_page_preview)
+
+    def _refresh_page_preview(self) -> None:
+        self._page_preview_job = None
+        if self._preview_renderer is None or self._loading:
+            return
+        continuous = self.paging_var.get() == "Continuous"
+        if self._source_file is not None:
+            html, source_path = "", self._source_file
+        else:
+            if self._large_file_mode:
+                # Render the lazily synced copy; it is only refreshed when
+                # the buffer changed, like the browser preview's
+                self._sync_latest_html()
+                html = self._latest_html
+            else:
+                html = self.html_text.get("1.0", "end-1c")
+            source_path = None
+            if not html.strip():
+                return
+
+        def on_rendered(result: Dict[str, Any]) -> None:
+            self.after(0, lambda: self._show_page_thumbnails(result))
+
+        self._preview_renderer.request(html, continuous, on_rendered, source_path=source_path)
+
+    def _show_page_thumbnails(self, result: Dict[str, Any]) -> None:
+        if "error" in result:
+            self.status_var.set(f"Page preview failed: {result['error'].splitlines()[0]}")
+            return
+        import io
+        from PIL import Image
+
+        pages = result["pages"]
+        images: Dict[str, Any] = {}
+        for index, (key, png) in enumerate(pages):
+            image = self._page_images.get(key)
+            if image is None:
+                thumb = Image.open(io.BytesIO(png))
+                image = ctk.CTkImage(light_image=thumb, dark_image=thumb, size=thumb.size)
+            images[key] = image
+            if index < len(self._page_labels):
+                label = self._page_labels[index]
+                if label.cget("image") is image:
+                    continue
+                label.configure(image=image)
+            else:
+                label = ctk.CTkLabel(self.page_preview_frame, text="", image=image)
+                label.grid(row=index, column=0, padx=4, pady=4)
+                self._page_labels.append(label)
+        for label in self._page_labels[len(pages):]:
+            label.destroy()
+        del self._page_labels[len(pages):]
+        # Keep only the images on screen; the renderer caches the PNGs
+        self._page_images = images
+        self.status_var.set(
+            f"Page preview: {result['rendered']} of {len(pages)} page(s) re-rendered in {result['elapsed_s']:.1f}s"
+        )
+
     def _on_text_modified(self, _event=None) -> None:
         # Reset modified flag immediately
         try:
@@ -546,20 +2901,51 @@ class HtmlToPdfApp(ctk.CTk):
         except Exception:
             pass
 
+        # Chunked loads and the convert-from-disk notice are not user edits
+        if self._loading or self._source_file is not None:
+            return
+
         # Debounce updates to reduce churn
         if self._debounce_job is not None:
             try:
                 self.after_cancel(self._debounce_job)
             except Exception:
                 pass
-        self._debounce_job = self.after(300, self._update_latest_html_from_editor)
+        delay = 1500 if self._large_file_mode else 300
+        self._debounce_job = self.after(delay, self._update_latest_html_from_editor)
         self._schedule_highlight()
+        self._schedule_page_preview()
 
     def _update_latest_html_from_editor(self) -> None:
+        if self._large_file_mode:
+            # Don't copy a multi-megabyte buffer after every pause in typing;
+            # only keep _latest_html fresh while a preview is being shown
+            self._editor_dirty = True
+            if self._preview_server is not None or self.page_preview_var.get():
+                self._sync_latest_html()
+            if self._autosave_job is None:
+                self._autosave_job = self.after(LARGE_FILE_AUTOSAVE_MS, self._autosave_large_file)
+            return
         self._latest_html = self.html_text.get("1.0", "end-1c")
+        if len(self._latest_html) > LARGE_FILE_THRESHOLD:
+            self._large_file_mode = True
         # No UI update necessary; browser polls the server
         self._autosave_session()
 
+    def _autosave_large_file(self) -> None:
+        """Timer-driven autosave for large-file mode: one buffer copy per interval."""
+        self._autosave_job = None
+        if self._loading or self._source_file is not None:
+            return
+        self._sync_latest_html()
+        self._autosave_session()
+
+    def _sync_latest_html(self) -> None:
+        """Copy the editor buffer into _latest_html if it changed since the last copy."""
+        if self._editor_dirty:
+            self._latest_html = self.html_text.get("1.0", "end-1c")
+            self._editor_dirty = False
+
     def _start_preview_server(self) -> Tuple[socketserver.TCPServer, int, threading.Thread]:
         app_ref = self
 
@@ -599,7 +2985,12 @@ class HtmlToPdfApp(ctk.CTk):
                     self.end_headers()
                     self.wfile.write(content)
                 elif path == "/content":
-                    html_content = app_ref._latest_html
+                    source_file = app_ref._source_file
+                    if source_file is not None:
+                        with open(source_file, "r", encoding="utf-8") as f:
+                            html_content = f.read()
+                    else:
+                        html_content = app_ref._latest_html
                     
                     # Detect React/JSX code
                     is_react = (
@@ -700,7 +3091,7 @@ class HtmlToPdfApp(ctk.CTk):
                                     window.MathJax.typesetPromise();
                                 }
                             }, 500);
-                            </script>"
+                            </script>"""
                             "</body></html>"
                         ).encode("utf-8")
                     else:
@@ -723,6 +3114,15 @@ class HtmlToPdfApp(ctk.CTk):
         return httpd, port, server_thread
 
     def _on_close(self) -> None:
+        # Cancel running conversions so their browsers are torn down
+        for job, future in list(self._active_jobs.items()):
+            future.cancel()
+            job.cancel()
+        if self._preview_renderer is not None:
+            self._preview_renderer.close()
+        if self._autosave_job is not None:
+            self.after_cancel(self._autosave_job)
+            self._autosave_job = None
         # Stop preview server if running
         if self._preview_server is not None:
             try:
@@ -732,12 +3132,13 @@ class HtmlToPdfApp(ctk.CTk):
             except Exception:
                 pass
             self._preview_server = None
-        # Final autosave
-        try:
-            self._latest_html = self.html_text.get("1.0", "end-1c")
-            self._autosave_session()
-        except Exception:
-            pass
+        # Final autosave (a file converted from disk is already on disk)
+        if self._source_file is None and not self._loading:
+            try:
+                self._latest_html = self.html_text.get("1.0", "end-1c")
+                self._autosave_session()
+            except Exception:
+                pass
         self.destroy()
 
     # ---------- File operations ----------
@@ -748,9 +3149,30 @@ class HtmlToPdfApp(ctk.CTk):
         )
         if not path:
             return
+        if self._loading:
+            self.status_var.set("Still loading the previous file, please wait...")
+            return
         try:
+            size = os.path.getsize(path)
+            if size > LARGE_FILE_THRESHOLD:
+                choice = messagebox.askyesnocancel(
+                    "Large file",
+                    f"{os.path.basename(path)} is {size / (1024 * 1024):.1f} MB.\n\n"
+                    "Yes: load it into the editor (in the background).\n"
+                    "No: convert it directly from disk without loading it.",
+                )
+                if choice is None:
+                    return
+                self._current_file = path
+                if choice:
+                    self._load_file_in_chunks(path, f"Opened: {os.path.basename(path)}")
+                else:
+                    self._use_file_from_disk(path)
+                return
             with open(path, "r", encoding="utf-8") as f:
                 data = f.read()
+            self._leave_disk_mode()
+            self._large_file_mode = False
             self.html_text.delete("1.0", "end")
             self.html_text.insert("1.0", data)
             self._latest_html = data
@@ -760,7 +3182,85 @@ class HtmlToPdfApp(ctk.CTk):
         except Exception as exc:
             messagebox.showerror("Error", f"Could not open file:\n\n{exc}")
 
+    def _load_file_in_chunks(self, path: str, done_message: str) -> None:
+        """Stream ``path`` into the editor from a reader thread, reporting progress."""
+        self._leave_disk_mode()
+        self._large_file_mode = True
+        self._loading = True
+        self._editor_dirty = True
+        self.html_text.delete("1.0", "end")
+        name = os.path.basename(path)
+        total = max(1, os.path.getsize(path))
+        chunks: "queue.Queue[Any]" = queue.Queue(maxsize=8)
+
+        def reader() -> None:
+            try:
+                decoder = codecs.getincrementaldecoder("utf-8")()
+                with open(path, "rb") as f:
+                    while True:
+                        block = f.read(LOAD_CHUNK_BYTES)
+                        if not block:
+                            chunks.put((decoder.decode(b"", final=True), total))
+                            break
+                        chunks.put((decoder.decode(block), f.tell()))
+                chunks.put(None)
+            except Exception as exc:
+                chunks.put(exc)
+
+        def pump() -> None:
+            # A few chunks per tick keeps the UI responsive between inserts
+            for _ in range(4):
+                try:
+                    item = chunks.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._loading = False
+                    self.status_var.set(done_message)
+                    self._schedule_highlight()
+                    self._schedule_page_preview()
+                    return
+                if isinstance(item, Exception):
+                    self._loading = False
+                    self.status_var.set("Failed to load file")
+                    messagebox.showerror("Error", f"Could not open file:\n\n{item}")
+                    return
+                text, done = item
+                self.html_text.insert("end-1c", text)
+                self.status_var.set(f"Loading {name}... {done * 100 // total}%")
+            self.after(10, pump)
+
+        threading.Thread(target=reader, daemon=True).start()
+        self.after(0, pump)
+
+    def _use_file_from_disk(self, path: str) -> None:
+        """Convert ``path`` straight from disk, leaving the editor read-only."""
+        self._source_file = path
+        self._latest_html = ""
+        self._editor_dirty = False
+        self.html_text.configure(state="normal")
+        self.html_text.delete("1.0", "end")
+        self.html_text.insert(
+            "1.0",
+            f"<!-- {path} is converted directly from disk and not loaded into the editor. -->\n"
+            "<!-- Open another file to edit. -->\n",
+        )
+        self.html_text.configure(state="disabled")
+        self.status_var.set(f"Using from disk: {os.path.basename(path)}")
+        self._schedule_page_preview()
+
+    def _leave_disk_mode(self) -> None:
+        if self._source_file is not None:
+            self._source_file = None
+            self.html_text.configure(state="normal")
+
     def on_save_click(self) -> None:
+        if self._loading:
+            self.status_var.set("Still loading the file, please wait...")
+            return
+        if self._source_file is not None:
+            self.status_var.set("File is converted from disk; nothing to save")
+            return
         if self._current_file is None:
             return self.on_save_as_click()
         try:
@@ -772,6 +3272,9 @@ class HtmlToPdfApp(ctk.CTk):
             messagebox.showerror("Error", f"Could not save file:\n\n{exc}")
 
     def on_save_as_click(self) -> None:
+        if self._loading:
+            self.status_var.set("Still loading the file, please wait...")
+            return
         path = filedialog.asksaveasfilename(
             title="Save HTML As...",
             defaultextension=".html",
@@ -781,6 +3284,13 @@ class HtmlToPdfApp(ctk.CTk):
         if not path:
             return
         try:
+            if self._source_file is not None:
+                if os.path.abspath(path) != os.path.abspath(self._source_file):
+                    shutil.copyfile(self._source_file, path)
+                    self._source_file = path
+                self._current_file = path
+                self.status_var.set(f"Saved: {os.path.basename(path)}")
+                return
             data = self.html_text.get("1.0", "end-1c")
             with open(path, "w", encoding="utf-8") as f:
                 f.write(data)
@@ -821,6 +3331,8 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    # Conversion jobs run in spawned worker processes; required for frozen builds
+    multiprocessing.freeze_support()
     # Handle command line arguments for PyInstaller
     import sys
     if len(sys.argv) > 1 and sys.argv[1] == "--help":
@@ -828,8 +3340,21 @@ if __name__ == "__main__":
         print("A cross-platform GUI app for converting HTML to PDF, DOCX, and PPTX.")
         print("\nUsage:")
         print("  python html_to_pdf_app.py    # Start GUI")
+        print("  python html_to_pdf_app.py --convert {pdf,png,docx,pptx} IN.html OUT [--continuous] [--timeout S]")
+        print("  python html_to_pdf_app.py --bundle OUT.pdf IN1.html IN2.html ... [--continuous] [--optimize]")
+        print("  python html_to_pdf_app.py --serve [--host H] [--port P] [--slots N]")
+        print("  python html_to_pdf_app.py --coordinate MANIFEST.json --workers H:P,H:P [--out DIR]")
         print("  python html_to_pdf_app.py --help  # Show this help")
+        print("\nExit codes (--convert): 0 ok, 1 failed, 2 usage, 3 timeout, 4 cancelled, 5 renderer crashed")
         sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == "--convert":
+        sys.exit(run_cli(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "--bundle":
+        sys.exit(run_bundle_cli(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        sys.exit(run_server_cli(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "--coordinate":
+        sys.exit(run_coordinator_cli(sys.argv[2:]))
 
     try:
         main()